@@ -0,0 +1,130 @@
+# animation.py
+"""
+Central frame scheduler for the Tk client.
+
+All animations run from one `after` loop. A track is a step(t) callback with t in
+[0, 1] derived from the wall clock, so if a frame is late or skipped the next one
+just jumps ahead instead of slowing the animation down. If the tracks of one frame
+take longer than the frame budget, the rest wait for the next frame (frame drop)
+rather than blocking input handling.
+
+Tracks are expected to create their canvas items once and move / recolor them
+with coords() / itemconfig() in step(). cancel() stops everything, e.g. when the
+screen is rebuilt.
+
+A track added with frames=N only changes its picture N times per duration (see
+frame_index). It is stepped once per frame change, and the loop sleeps until the
+next change of any track, so a slow looping preview costs a few wakeups a
+second instead of fps.
+"""
+import time
+from typing import Callable, Dict
+
+class _Track:
+    __slots__ = ('step', 'duration', 'loop', 'done', 'start', 'frames', 'shown')
+
+    def __init__(self, step, duration, loop, done, start, frames):
+        self.step = step
+        self.duration = duration
+        self.loop = loop
+        self.done = done
+        self.start = start
+        self.frames = frames
+        self.shown = 0   # last frame stepped (counting on across loops)
+
+    def period(self) -> float:
+        """Seconds per frame for frame-counted tracks, 0 for smooth ones."""
+        return self.duration / self.frames if self.frames and self.duration else 0.0
+
+class Animator:
+    def __init__(self, root, fps: int = 60, budget_ms: float = None):
+        self.root = root
+        self.frame_ms = max(1, 1000 // fps)
+        # work allowed per frame; by default half a frame so input stays responsive
+        self.budget = (budget_ms if budget_ms is not None else self.frame_ms / 2) / 1000.0
+        self.tracks: Dict[str, _Track] = {}
+        self.dropped = 0
+        self._job = None
+        self._next = 0   # round-robin start so over-budget frames don't starve late tracks
+
+    def add(self, name: str, duration_ms: float, step: Callable[[float], None],
+            done: Callable[[], None] = None, loop: bool = False, frames: int = None):
+        """
+        Start (or restart) track `name`: step(t) every frame for duration_ms, then done().
+        frames: the track only has this many distinct pictures per duration; it is then
+        stepped once per picture instead of every frame.
+        """
+        self.cancel(name)
+        self.tracks[name] = _Track(step, duration_ms / 1000.0, loop, done, time.perf_counter(), frames)
+        step(0.0)
+        self._schedule()
+
+    def cancel(self, name: str = None):
+        """Stop one track, or all of them. done() is not called for cancelled tracks."""
+        if name is None:
+            self.tracks.clear()
+        else:
+            self.tracks.pop(name, None)
+        if not self.tracks and self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def running(self, name: str) -> bool:
+        return name in self.tracks
+
+    def _wait(self, track: _Track, now: float) -> float:
+        """Seconds until track needs its next step (0: at the next frame)."""
+        period = track.period()
+        if not period:
+            return 0.0
+        elapsed = now - track.start
+        frame = int(elapsed // period)
+        if frame != track.shown:
+            return 0.0   # skipped by an over-budget frame
+        return min((frame + 1) * period, track.duration if not track.loop else float('inf')) - elapsed
+
+    def _schedule(self):
+        """(Re)arm the loop for the earliest track that needs a step; never faster than fps."""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        if self.tracks:
+            now = time.perf_counter()
+            wait = min(self._wait(track, now) for track in self.tracks.values())
+            # +1 ms so the wakeup lands inside the next frame, not on its boundary
+            self._job = self.root.after(max(self.frame_ms, int(wait * 1000) + 1), self._tick)
+
+    def _tick(self):
+        self._job = None
+        t0 = time.perf_counter()
+        names = list(self.tracks)
+        k = self._next % len(names) if names else 0
+        order = names[k:] + names[:k]
+        for i, name in enumerate(order):
+            if i and time.perf_counter() - t0 > self.budget:
+                self.dropped += len(order) - i
+                self._next = k + i
+                break
+            track = self.tracks.get(name)
+            if track is None:
+                continue
+            elapsed = time.perf_counter() - track.start
+            t = elapsed / track.duration if track.duration else 1.0
+            if t >= 1.0 and not track.loop:
+                del self.tracks[name]
+                track.step(1.0)
+                if track.done is not None:
+                    track.done()
+                continue
+            period = track.period()
+            if period:
+                frame = int(elapsed // period)
+                if frame == track.shown:
+                    continue   # woken for another track; nothing new to draw
+                track.shown = frame
+            track.step(t % 1.0)
+        self._schedule()
+
+def frame_index(t: float, frames: int) -> int:
+    """Which of `frames` discrete frames t in [0, 1] falls on."""
+    return min(frames - 1, int(t * frames))
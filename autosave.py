@@ -0,0 +1,149 @@
+# autosave.py
+"""
+Background autosave.
+
+save(game) only takes a snapshot on the calling thread: Game.get_state(planes=True),
+whose packed planes are immutable bytes. Encoding, compression and the write happen
+on a worker thread, so saving a large board never blocks the Tk event loop.
+
+- Coalescing: requests for the same target that arrive while an earlier one is
+  still waiting replace it. Autosaves also wait `delay` seconds before writing,
+  so a burst of clicks becomes one write of the latest state.
+- Rotating slots: autosave k goes to {base}.{k % slots}.sav, so the previous
+  `slots - 1` autosaves survive even a bad write.
+- Atomic writes: file_manager.save_game (temp file + rename).
+
+    saver = AutoSaver(slots=3)
+    saver.save(game)                     # rotating autosave slot
+    saver.save(game, SAVE_FILENAME)      # explicit file, written as soon as possible
+    state = saver.load_latest()          # newest readable slot, or None
+"""
+import glob
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import file_manager
+
+AUTOSAVE_BASE = "minesweeper autosave"
+
+class AutoSaver:
+    def __init__(self, base: str = AUTOSAVE_BASE, slots: int = 3, delay: float = 0.5,
+                 compress: bool = True, fsync: bool = False):
+        self.base = base
+        self.slots = max(1, int(slots))
+        self.delay = delay
+        self.compress = compress
+        self.fsync = fsync
+        self.saved = 0            # files written
+        self.coalesced = 0        # requests replaced by a newer one before being written
+        self.last_error: Optional[BaseException] = None
+        existing = self.slot_paths()
+        # continue the rotation after the newest slot left by an earlier run
+        self._next_slot = (_slot_number(existing[0], base) + 1) % self.slots if existing else 0
+        self._pending: Dict[Optional[str], Dict[str, Any]] = {}   # target (None = next slot) -> state
+        self._first_request = 0.0
+        self._busy = False
+        self._closing = False
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._worker.start()
+
+    # -----------------------
+    # Requests
+    # -----------------------
+    def save(self, game, path: str = None):
+        """Snapshot game now; it is written in the background (to path, or the next autosave slot)."""
+        state = game.get_state(planes=True)
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("AutoSaver is closed")
+            if path in self._pending:
+                self.coalesced += 1
+            elif not self._pending:
+                self._first_request = time.monotonic()
+            self._pending[path] = state
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Write everything requested so far without waiting for the delay; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._first_request = 0.0
+            self._cond.notify_all()
+            while self._pending or self._busy:
+                left = None if deadline is None else deadline - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout: float = None):
+        """Flush pending saves and stop the worker."""
+        self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._worker.join(timeout)
+
+    # -----------------------
+    # Worker
+    # -----------------------
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # only autosaves wait out the delay; explicit saves and flush() go at once
+                while (set(self._pending) == {None} and not self._closing
+                       and time.monotonic() < self._first_request + self.delay):
+                    self._cond.wait(self._first_request + self.delay - time.monotonic())
+                jobs, self._pending = self._pending, {}
+                self._busy = True
+            try:
+                for path, state in jobs.items():
+                    self._write(path, state)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, path: Optional[str], state: Dict[str, Any]):
+        if path is None:
+            path = self.slot_path(self._next_slot)
+            self._next_slot = (self._next_slot + 1) % self.slots
+        try:
+            # through save_game, so instrument.py's save timings include autosaves
+            file_manager.save_game(state, path, compress=self.compress, fsync=self.fsync)
+            self.saved += 1
+        except Exception as e:
+            # any failure (a bad state included) is reported, never allowed to stop the worker
+            self.last_error = e
+
+    # -----------------------
+    # Slots
+    # -----------------------
+    def slot_path(self, k: int) -> str:
+        return f"{self.base}.{k}.sav"
+
+    def slot_paths(self) -> List[str]:
+        """Existing autosave slots, newest first."""
+        paths = [p for p in glob.glob(glob.escape(self.base) + '.*.sav')
+                 if 0 <= _slot_number(p, self.base) < self.slots]
+        return sorted(paths, key=lambda p: os.stat(p).st_mtime_ns, reverse=True)
+
+    def load_latest(self) -> Optional[Dict[str, Any]]:
+        """State from the newest autosave that can be read (older slots are the fallback)."""
+        for path in self.slot_paths():
+            try:
+                return file_manager.load_game(path)
+            except (OSError, ValueError):
+                continue
+        return None
+
+def _slot_number(path: str, base: str) -> int:
+    slot = path[len(base) + 1:].split('.', 1)[0]
+    return int(slot) if slot.isdigit() else -1
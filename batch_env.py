@@ -0,0 +1,187 @@
+# batch_env.py
+"""
+Vectorized environment running B boards of one size in lockstep (needs numpy).
+
+State is stacked arrays of shape (B, n, n); one step applies one action per board:
+    action < n*n         reveal cell action          (row-major flat index)
+    action >= n*n        toggle the flag on cell action - n*n
+Reveal, flood fill, flagging and win / loss are evaluated for all boards at once.
+The flood fill grows the zeros opened this step on every board together, by
+repeated 3x3 dilation until no board has a new zero.
+
+Episodes are dealt from seeds: board i plays seeds seed + i, seed + i + B,
+seed + i + 2B, ... and its mines match Game(size, mines, seed=that seed) for the
+same first click. Finished boards are reset automatically within the same step.
+
+Observations are one int8 array (B, n, n): HIDDEN (-1), FLAG (-2), or 0..8.
+Rewards: +1 for the move that wins, -1 for hitting a mine, 0 otherwise.
+
+    env = BatchEnv(4096, 22, 99, seed=0)
+    obs = env.reset()
+    obs, reward, done, won = env.step(actions)
+"""
+import random
+from typing import Tuple
+
+import numpy as np
+
+from board import MINE
+from numpy_board import NumpyBoard
+
+HIDDEN = -1
+FLAG = -2
+
+def _dilate(mask: np.ndarray) -> np.ndarray:
+    """3x3 dilation of a (B, n, n) bool array."""
+    b, n_r, n_c = mask.shape
+    padded = np.zeros((b, n_r + 2, n_c + 2), dtype=bool)
+    padded[:, 1:-1, 1:-1] = mask
+    out = np.zeros_like(mask)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            out |= padded[:, dr:dr+n_r, dc:dc+n_c]
+    return out
+
+class BatchEnv:
+    def __init__(self, batch: int, size: int = 9, mines: int = 10, seed: int = 0):
+        self.batch = int(batch)
+        self.size = int(size)
+        self.mines = int(mines)
+        self.safe_cells = self.size * self.size - self.mines
+        self.seed = int(seed)
+        b, n = self.batch, self.size
+        self.grid = np.zeros((b, n, n), dtype=np.int8)
+        self.revealed = np.zeros((b, n, n), dtype=bool)
+        self.flagged = np.zeros((b, n, n), dtype=bool)
+        self.generated = np.zeros(b, dtype=bool)
+        self.revealed_safe = np.zeros(b, dtype=np.int64)
+        self.seeds = np.zeros(b, dtype=np.int64)         # seed of each board's current episode
+        self.episode = np.zeros(b, dtype=np.int64)       # episodes each board has started
+        self._scratch = NumpyBoard(n, self.mines)         # generation helper
+        self.reset()
+
+    # -----------------------
+    # Episodes
+    # -----------------------
+    def reset(self, which: np.ndarray = None) -> np.ndarray:
+        """Start new episodes on every board (or the boards in index array `which`); returns observations."""
+        idx = np.arange(self.batch) if which is None else np.asarray(which)
+        # episode k of board i uses seed + i + k*B
+        self.seeds[idx] = self.seed + idx + self.batch * self.episode[idx]
+        self.episode[idx] += 1
+        self.grid[idx] = 0
+        self.revealed[idx] = False
+        self.flagged[idx] = False
+        self.generated[idx] = False
+        self.revealed_safe[idx] = 0
+        return self.observe()
+
+    def _generate(self, boards: np.ndarray, cells: np.ndarray):
+        """Deal boards[i] with a safe first click at flat cell cells[i], exactly like Game(seed=...)."""
+        n = self.size
+        scratch = self._scratch
+        mine = np.zeros((len(boards), n * n), dtype=bool)
+        for k, (i, cell) in enumerate(zip(boards.tolist(), cells.tolist())):
+            scratch.rng = random.Random(int(self.seeds[i]))
+            mine[k, scratch.pick_mines(*divmod(cell, n))] = True
+        mine = mine.reshape(len(boards), n, n)
+        # neighbor counts for all new boards at once
+        padded = np.zeros((len(boards), n + 2, n + 2), dtype=np.int8)
+        padded[:, 1:-1, 1:-1] = mine
+        counts = np.zeros(mine.shape, dtype=np.int8)
+        for dr in (0, 1, 2):
+            for dc in (0, 1, 2):
+                if dr != 1 or dc != 1:
+                    counts += padded[:, dr:dr+n, dc:dc+n]
+        counts[mine] = MINE
+        self.grid[boards] = counts
+        self.generated[boards] = True
+        self.flagged[boards] = False   # generating clears flags, as it does on the single boards
+
+    # -----------------------
+    # Stepping
+    # -----------------------
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Apply one action per board. Returns (observations, rewards, done, won); boards
+        with done set were reset before the observations were taken.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        n = self.size
+        cells = n * n
+        b = self.batch
+        reward = np.zeros(b, dtype=np.int8)
+
+        flag = actions >= cells
+        cell = np.where(flag, actions - cells, actions)
+        rows, cols = np.divmod(cell, n)
+        ar = np.arange(b)
+
+        # flags: toggle on hidden cells
+        fb = ar[flag]
+        if fb.size:
+            fr, fc = rows[fb], cols[fb]
+            hidden = ~self.revealed[fb, fr, fc]
+            self.flagged[fb[hidden], fr[hidden], fc[hidden]] ^= True
+
+        # reveals: hidden, unflagged target cells only
+        rb = ar[~flag]
+        rr, rc = rows[rb], cols[rb]
+        fresh = ~self.generated[rb]
+        if fresh.any():
+            self._generate(rb[fresh], cell[rb][fresh])
+        ok = ~self.revealed[rb, rr, rc] & ~self.flagged[rb, rr, rc]
+        rb, rr, rc = rb[ok], rr[ok], rc[ok]
+        value = self.grid[rb, rr, rc]
+        hit = value == MINE
+        lost = rb[hit]
+        self.revealed[rb, rr, rc] = True
+        self.revealed_safe[rb[~hit]] += 1
+
+        # batched flood fill, only on boards that opened a zero
+        zero = value == 0
+        if zero.any():
+            self._flood(rb[zero], rr[zero], rc[zero])
+
+        won = (self.revealed_safe == self.safe_cells) & self.generated
+        won[lost] = False
+        done = won.copy()
+        done[lost] = True
+        reward[won] = 1
+        reward[lost] = -1
+        if done.any():
+            self.reset(ar[done])
+        return self.observe(), reward, done, won
+
+    def _flood(self, boards: np.ndarray, rows: np.ndarray, cols: np.ndarray):
+        """Open around the zeros just revealed at (rows[i], cols[i]) of boards[i]."""
+        grid = self.grid[boards]
+        revealed = self.revealed[boards]
+        closed = revealed | self.flagged[boards]
+        zero = grid == 0
+        # grow only from newly opened zeros: cells unflagged after an earlier cascade stay hidden
+        front = np.zeros_like(revealed)
+        front[np.arange(len(boards)), rows, cols] = True
+        active = np.arange(len(boards))
+        while active.size:
+            # boards whose cascade has stopped drop out of the next round
+            new = _dilate(front) & ~closed[active]
+            closed[active] |= new
+            revealed[active] |= new
+            front = new & zero[active]
+            keep = front.any(axis=(1, 2))
+            active, front = active[keep], front[keep]
+        self.revealed[boards] = revealed
+        self.revealed_safe[boards] = (revealed & (grid != MINE)).sum(axis=(1, 2))
+
+    # -----------------------
+    # Observations
+    # -----------------------
+    def observe(self, out: np.ndarray = None) -> np.ndarray:
+        """(B, n, n) int8: HIDDEN, FLAG or the revealed value (never shows hidden mines)."""
+        if out is None:
+            out = np.empty(self.grid.shape, dtype=np.int8)
+        out.fill(HIDDEN)
+        out[self.flagged] = FLAG
+        np.copyto(out, self.grid, where=self.revealed)
+        return out
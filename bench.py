@@ -0,0 +1,361 @@
+# bench.py
+"""
+Property checks and benchmarks for the board engines and Game.
+
+check: seeded games on every importable engine (see game_logic.ENGINES) are compared
+with a small, obviously correct reference implementation in this file:
+- first-click safety (no mine on the clicked cell or its neighbors when there is room)
+- exactly `mines` mines, and every number equals the reference neighbor count
+- each reveal opens exactly the cells of a reference flood fill (flags block it)
+- win / loss and the live counters (Board.debug cross-checks them on every query)
+- save / load round trips (plain, compressed, list form) and identical layouts
+  for the same seed on every engine
+- StatsStore.percentile against simulate.percentile on even and odd win counts
+
+run: fixed-seed timings of generate, first-click reveal, a large cascade, the win
+check, save_game / load_game and the viewport redraw computation, for sizes from
+9x9 up to 2000x2000. Results can be saved as JSON and compared with an earlier run.
+
+    python bench.py check --seeds 30
+    python bench.py run --save baseline.json
+    python bench.py run --compare baseline.json       # exit 1 on a regression
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Set, Tuple
+
+from board import Board, MINE
+from game_logic import Game, DIFFICULTIES, FINITE_ENGINES, available_engines
+import file_manager
+from simulate import percentile
+from stats import StatsStore
+
+Cell = Tuple[int, int]
+
+# the checks below assume one finite board, so the endless chunked engine is left out
+CHECK_SIZES = [9, 16, 22, 40]
+BENCH_SIZES = [9, 16, 22, 100, 500, 2000]
+VIEWPORT = 40   # tiles per side redrawn by the GUI at most (see MinesweeperApp._visible_range)
+
+def mines_for(size: int) -> int:
+    """Standard mine count for a difficulty size, else about 1 in 6 cells."""
+    for n, mines in DIFFICULTIES.values():
+        if n == size:
+            return mines
+    return size * size // 6
+
+def _neighbors(n: int, r: int, c: int):
+    for nr in (r-1, r, r+1):
+        for nc in (c-1, c, c+1):
+            if (nr != r or nc != c) and 0 <= nr < n and 0 <= nc < n:
+                yield nr, nc
+
+# -----------------------
+# Reference implementation
+# -----------------------
+def ref_counts(n: int, mines: Set[Cell]) -> List[List[int]]:
+    return [[MINE if (r, c) in mines else sum(p in mines for p in _neighbors(n, r, c))
+             for c in range(n)] for r in range(n)]
+
+def ref_flood(grid, revealed, flagged, r: int, c: int) -> Set[Cell]:
+    """Cells a reveal at (r, c) must open: breadth-first through zeros, never onto flags."""
+    if revealed[r][c] or flagged[r][c]:
+        return set()
+    n = len(grid)
+    opened = {(r, c)}
+    queue = [(r, c)]
+    while queue:
+        cr, cc = queue.pop()
+        if grid[cr][cc] != 0:
+            continue
+        for p in _neighbors(n, cr, cc):
+            if p not in opened and not revealed[p[0]][p[1]] and not flagged[p[0]][p[1]]:
+                opened.add(p)
+                queue.append(p)
+    return opened
+
+# -----------------------
+# Property checks
+# -----------------------
+def _copy(rows) -> List[List]:
+    return [list(row) for row in rows]
+
+def check_game(engine: str, size: int, mines: int, seed: int, moves: int = 60) -> List[str]:
+    """Play one seeded game with random reveals and flags; returns problems found."""
+    label = f"{engine} {size}x{size}/{mines} seed {seed}"
+    rng = random.Random(seed)
+    game = Game(size, mines, seed=seed, engine=engine)
+    problems = []
+    r, c = rng.randrange(size), rng.randrange(size)
+    game.left_click(r, c)
+    b = game.board
+    grid = _copy(b.to_lists()[0])
+    mine_cells = {(i, j) for i in range(size) for j in range(size) if grid[i][j] == MINE}
+    near = set(_neighbors(size, r, c)) | {(r, c)}
+    if (r, c) in mine_cells or (mines <= size*size - len(near) and mine_cells & near):
+        problems.append(f"{label}: mine next to the first click {(r, c)}")
+    if len(mine_cells) != mines:
+        problems.append(f"{label}: {len(mine_cells)} mines placed, expected {mines}")
+    if grid != ref_counts(size, mine_cells):
+        problems.append(f"{label}: neighbor counts differ from the reference")
+    expected = ref_flood(grid, [[False]*size for _ in range(size)], [[False]*size for _ in range(size)], r, c)
+    if _revealed_cells(b) != expected:
+        problems.append(f"{label}: first click opened {len(_revealed_cells(b))} cells, reference {len(expected)}")
+    for _ in range(moves):
+        if game.game_over or problems:
+            break
+        _, revealed, flagged = (_copy(x) for x in b.to_lists())
+        hidden = [(i, j) for i in range(size) for j in range(size) if not revealed[i][j]]
+        r, c = rng.choice(hidden)
+        if rng.random() < 0.25:
+            game.right_click(r, c)
+            if bool(b.flagged[r][c]) == bool(flagged[r][c]):
+                problems.append(f"{label}: flag at {(r, c)} did not toggle")
+            continue
+        expected = ref_flood(grid, revealed, flagged, r, c)
+        res = game.left_click(r, c)
+        opened = set(res['revealed'])
+        if (r, c) in mine_cells and expected:
+            opened -= mine_cells - {(r, c)}   # the other mines are shown on loss
+            if not res['hit_mine'] or not game.game_over or game.win:
+                problems.append(f"{label}: stepping on the mine at {(r, c)} did not end the game")
+        if opened != expected:
+            problems.append(f"{label}: reveal at {(r, c)} opened {len(opened)} cells, reference {len(expected)}")
+    cleared = all(b.revealed[i][j] for i in range(size) for j in range(size) if (i, j) not in mine_cells)
+    if cleared != bool(game.win):
+        problems.append(f"{label}: win is {game.win} but all safe cells revealed is {cleared}")
+    problems.extend(f"{label}: {p}" for p in game.verify())
+    if not problems:
+        problems.extend(f"{label}: {p}" for p in check_round_trip(game, engine))
+    return problems
+
+def _revealed_cells(board) -> Set[Cell]:
+    revealed = board.to_lists()[1]
+    return {(r, c) for r, row in enumerate(revealed) for c, v in enumerate(row) if v}
+
+def check_round_trip(game: Game, engine: str) -> List[str]:
+    problems = []
+    planes = game.get_state(planes=True)
+    for compress in (False, True):
+        copy = Game(engine=engine)
+        copy.load_state(file_manager.decode_state(file_manager.encode_state(planes, compress)))
+        if copy.get_state(planes=True) != planes:
+            problems.append(f"save / load (compress={compress}) changed the state")
+    copy = Game(engine=engine)
+    copy.load_state(game.get_state())
+    if copy.get_state(planes=True) != planes:
+        problems.append("list-form get_state / load_state changed the state")
+    return problems
+
+def check_engines_agree(engines: List[str], size: int, mines: int, seed: int) -> List[str]:
+    """The same seed and first click must give the same layout on every engine."""
+    layouts = {}
+    for engine in engines:
+        game = Game(size, mines, seed=seed, engine=engine)
+        game.left_click(size // 2, size // 2)
+        layouts[engine] = game.board.to_planes()[0]
+    if len(set(layouts.values())) > 1:
+        return [f"{size}x{size}/{mines} seed {seed}: engines disagree on the layout ({', '.join(layouts)})"]
+    return []
+
+def check_stats_percentiles(seed: int) -> List[str]:
+    """StatsStore's bucketed percentiles must match the plain nearest rank over sorted times."""
+    problems = []
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StatsStore(os.path.join(tmp, "stats.db"))
+        try:
+            for count in (1, 2, 6, 7, 200 + seed):   # even and odd counts
+                name = f"check{count}"
+                # repeated times and several wins per one-second bucket
+                times = [rng.choice((0.0, 0.5, 1.0, 1.25, 7.0, rng.uniform(0, 60))) for _ in range(count)]
+                store.record_many([(name, 9, 10, None, 1, t, '', 0.0) for t in times] +
+                                  [(name, 9, 10, None, 0, 1.0, '', 0.0)])
+                store.flush()
+                times.sort()
+                for q in (0, 1, 25, 50, 75, 99, 100):
+                    got, want = store.percentile(name, q), percentile(times, q)
+                    if got != want:
+                        problems.append(f"stats seed {seed}: p{q} of {count} wins is {got}, expected {want}")
+        finally:
+            store.close()
+    return problems
+
+def run_checks(engines: List[str], sizes: List[int], seeds: int) -> List[str]:
+    problems = []
+    Board.debug = True    # counters are cross-checked against full scans on every query
+    try:
+        for size in sizes:
+            # the standard density, a dense board (first-click fallback) and an open one
+            for mines in sorted({mines_for(size), size*size - 4, max(1, size*size // 50)}):
+                for seed in range(seeds):
+                    for engine in engines:
+                        problems.extend(check_game(engine, size, mines, seed))
+                    problems.extend(check_engines_agree(engines, size, mines, seed))
+        for seed in range(seeds):
+            problems.extend(check_stats_percentiles(seed))
+    finally:
+        Board.debug = False
+    return problems
+
+# -----------------------
+# Benchmarks
+# -----------------------
+def _best(fn: Callable[[], None], setup: Callable[[], object] = None, repeat: int = 3, inner: int = 1) -> float:
+    """Fastest of `repeat` runs, in seconds per call; setup() runs untimed before each run."""
+    best = float('inf')
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        t0 = time.perf_counter()
+        for _ in range(inner):
+            fn(arg)
+        best = min(best, (time.perf_counter() - t0) / inner)
+    return best
+
+def viewport_looks(board, r0: int, r1: int, c0: int, c1: int, heat=None) -> list:
+    """What MinesweeperApp._redraw_tile decides per visible tile, without a canvas."""
+    looks = []
+    grid, revealed, flagged = board.grid, board.revealed, board.flagged
+    for r in range(r0, r1):
+        for c in range(c0, c1):
+            if revealed[r][c]:
+                looks.append(('open', int(grid[r][c])))
+            elif flagged[r][c]:
+                looks.append(('flag', 0))
+            else:
+                looks.append(('hidden', heat[r, c] if heat is not None else 0))
+    return looks
+
+def bench_size(engine: str, size: int, repeat: int, seed: int = 0) -> Dict[str, float]:
+    mines = mines_for(size)
+    mid = size // 2
+    out = {}
+
+    def fresh(m=mines):
+        return Game(size, m, seed=seed, engine=engine)
+
+    def generated(m=mines):
+        game = fresh(m)
+        game.board.generate(mid, mid)
+        return game
+
+    out['generate'] = _best(lambda g: g.board.generate(mid, mid), fresh, repeat)
+    out['reveal'] = _best(lambda g: g.left_click(mid, mid, runs=True), generated, repeat)
+    # an open board: the first click floods most of it
+    sparse = max(1, size * size // 100)
+    out['cascade'] = _best(lambda g: g.left_click(mid, mid, runs=True), lambda: generated(sparse), repeat)
+
+    game = generated()
+    game.left_click(mid, mid, runs=True)
+    out['win_check'] = _best(lambda _: game.board.all_safe_revealed(), repeat=repeat, inner=10000)
+    h = min(VIEWPORT, size)
+    r0 = c0 = max(0, mid - h // 2)
+    out['redraw'] = _best(lambda _: viewport_looks(game.board, r0, r0 + h, c0, c0 + h), repeat=repeat,
+                          inner=max(1, 20000 // (h * h)))
+
+    fd, path = tempfile.mkstemp(suffix='.sav')
+    os.close(fd)
+    try:
+        out['save'] = _best(lambda _: file_manager.save_game(game.get_state(planes=True), path), repeat=repeat)
+        out['load'] = _best(lambda _: Game(engine=engine).load_state(file_manager.load_game(path)), repeat=repeat)
+    finally:
+        for p in (path, path + '.tmp'):
+            if os.path.exists(p):
+                os.remove(p)
+    return out
+
+def run_benchmarks(engines: List[str], sizes: List[int], repeat: int, log=print) -> Dict[str, float]:
+    results = {}
+    for size in sizes:
+        for engine in engines:
+            t0 = time.perf_counter()
+            for name, seconds in bench_size(engine, size, repeat).items():
+                results[f"{name}/{engine}/{size}"] = seconds
+            log(f"  {engine:7} {size:>5}x{size:<5} {time.perf_counter() - t0:6.1f}s")
+    return results
+
+def compare(old: Dict[str, float], new: Dict[str, float], threshold: float) -> Tuple[List[str], List[str]]:
+    """(table lines, regressions): a regression is new / old above threshold."""
+    lines, regressions = [], []
+    for key in sorted(new, key=lambda k: (int(k.rsplit('/', 1)[1]), k)):
+        if key not in old or not old[key]:
+            continue
+        ratio = new[key] / old[key]
+        mark = ''
+        if ratio > threshold:
+            mark = '  REGRESSION'
+            regressions.append(key)
+        lines.append(f"{key:28} {old[key]*1e3:11.4g} {new[key]*1e3:11.4g} ms {ratio:6.2f}x{mark}")
+    return lines, regressions
+
+def _format(results: Dict[str, float]) -> str:
+    lines = [f"{'benchmark':28} {'ms':>11}"]
+    for key in sorted(results, key=lambda k: (int(k.rsplit('/', 1)[1]), k)):
+        lines.append(f"{key:28} {results[key]*1e3:11.4g}")
+    return "\n".join(lines)
+
+# -----------------------
+# Command line
+# -----------------------
+def cmd_check(args) -> int:
+    engines = available_engines(args.engines)
+    t0 = time.perf_counter()
+    problems = run_checks(engines, args.sizes, args.seeds)
+    for p in problems:
+        print(p)
+    print(f"checked {', '.join(engines)} on sizes {args.sizes}, {args.seeds} seeds each: "
+          f"{len(problems)} problems ({time.perf_counter() - t0:.1f}s)")
+    return 1 if problems else 0
+
+def cmd_run(args) -> int:
+    engines = available_engines(args.engines)
+    print(f"benchmarking {', '.join(engines)}, best of {args.repeat}")
+    results = run_benchmarks(engines, args.sizes, args.repeat)
+    print(_format(results))
+    if args.save:
+        meta = {'python': platform.python_version(), 'machine': platform.machine(),
+                'platform': platform.platform(), 'time': time.time(), 'repeat': args.repeat}
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2, sort_keys=True)
+        print(f"saved to {args.save}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            old = json.load(f)['results']
+        lines, regressions = compare(old, results, args.threshold)
+        print(f"\n{'benchmark':28} {'before':>11} {'after':>11}")
+        print("\n".join(lines))
+        if regressions:
+            print(f"{len(regressions)} regressions over {args.threshold:.2f}x")
+            return 1
+    return 0
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Board engine property checks and benchmarks")
+    sub = ap.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('check', help="compare engines with the reference implementation")
+    p.add_argument('--engines', nargs='+', default=None, help=f"default: {' '.join(FINITE_ENGINES)} (if installed)")
+    p.add_argument('--sizes', nargs='+', type=int, default=CHECK_SIZES)
+    p.add_argument('--seeds', type=int, default=10)
+    p.set_defaults(func=cmd_check)
+
+    p = sub.add_parser('run', help="fixed-seed benchmarks")
+    p.add_argument('--engines', nargs='+', default=None, help=f"default: {' '.join(FINITE_ENGINES)} (if installed)")
+    p.add_argument('--sizes', nargs='+', type=int, default=BENCH_SIZES)
+    p.add_argument('--repeat', type=int, default=3)
+    p.add_argument('--save', default=None, help="write results as JSON")
+    p.add_argument('--compare', default=None, help="JSON from an earlier --save")
+    p.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio reported as a regression")
+    p.set_defaults(func=cmd_run)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -83,50 +83,153 @@ Board logic for Minesweeper.
 from typing import List, Tuple
 import random
 
+from planes import grid_to_cells, cells_to_grid, bools_to_bits, bits_to_bools
+
 MINE = -1
 
+def runs_to_cells(runs) -> List[Tuple[int,int]]:
+    """Expand (row, col_start, col_end) runs into (r, c) cells."""
+    return [(r, c) for (r, lo, hi) in runs for c in range(lo, hi+1)]
+
+def sample_mines(rng, size: int, mines: int, start_r: int, start_c: int) -> List[int]:
+    """
+    Flat indices (r*size + c) of `mines` random cells, avoiding the start cell and its
+    neighbors (only the start cell when the board is too dense for that).
+
+    Draws exactly what rng.sample(candidate_cells, mines) would: sample() only looks
+    at len(population), so sampling positions in range() and mapping each one past
+    the excluded cells gives the same layout for the same seed. No candidate list
+    is built, so time and memory grow with the mine count, not the board.
+    """
+    excluded = [nr*size + nc for nr in (start_r-1, start_r, start_r+1) for nc in (start_c-1, start_c, start_c+1)
+                if 0 <= nr < size and 0 <= nc < size]
+    if mines > size*size - len(excluded):
+        excluded = [start_r*size + start_c]
+    picks = rng.sample(range(size*size - len(excluded)), mines)
+    # position k among the candidates -> cell index: skip every excluded cell at or before it
+    for i, k in enumerate(picks):
+        for e in excluded:
+            if k >= e:
+                k += 1
+        picks[i] = k
+    return picks
+
+def cells_to_runs(cells) -> List[Tuple[int,int,int]]:
+    """Collapse (r, c) cells into sorted (row, col_start, col_end) runs."""
+    runs = []
+    for (r, c) in sorted(cells):
+        if runs and runs[-1][0] == r and runs[-1][2] == c - 1:
+            runs[-1] = (r, runs[-1][1], c)
+        else:
+            runs.append((r, c, c))
+    return runs
+
 class Board:
+    __slots__ = ('size', 'mines', 'rng', 'grid', 'revealed', 'flagged', 'mine_positions',
+                 'generated', 'revealed_safe', 'flags_placed', 'layout_provider', 'guess_free',
+                 '_packed_grid')
+    # when True, the O(1) counter queries are cross-checked against a full scan
+    debug: bool = False
+
     def __init__(self, size: int = 9, mines: int = 10, rng: random.Random = random):
         self.size = int(size)
         self.mines = int(mines)
         self.rng = rng
+        # optional callable(board, start_r, start_c) -> mine positions or None,
+        # consulted by generate() before falling back to random placement
+        self.layout_provider = None
+        # set by no-guess providers: True if the dealt layout is proven guess-free,
+        # False if none was found and generate() fell back to random placement
+        self.guess_free = None
+        # per-engine storage; overridden by subclasses so no list grid is built for them
+        self.reset_arrays()
+
+    def reset_arrays(self):
         # grid: MINE (-1) for mine, otherwise 0..8 for adjacent mine counts
         self.grid: List[List[int]] = [[0]*self.size for _ in range(self.size)]
         self.revealed: List[List[bool]] = [[False]*self.size for _ in range(self.size)]
         self.flagged: List[List[bool]] = [[False]*self.size for _ in range(self.size)]
         self.mine_positions: List[Tuple[int,int]] = []
         self.generated: bool = False
+        # live counters so win checks and flag counts don't scan the grid
+        self.revealed_safe: int = 0
+        self.flags_placed: int = 0
+        # to_planes() cache of the grid, which is fixed once the board is dealt
+        self._packed_grid = None
 
-    def reset_arrays(self):
-        self.grid = [[0]*self.size for _ in range(self.size)]
-        self.revealed = [[False]*self.size for _ in range(self.size)]
-        self.flagged = [[False]*self.size for _ in range(self.size)]
-        self.mine_positions = []
-        self.generated = False
+    def set_arrays(self, grid, revealed, flagged, mine_positions, generated: bool):
+        """Adopt externally supplied state (used by Game.load_state)."""
+        self.grid = grid
+        self.revealed = revealed
+        self.flagged = flagged
+        self.mine_positions = [tuple(p) for p in mine_positions]
+        self.generated = bool(generated)
+        self._packed_grid = None
+        self.recount()
+
+    def scan_counts(self) -> Tuple[int,int]:
+        """Full-grid scan: (revealed safe cells, placed flags)."""
+        revealed_safe = sum(1 for r in range(self.size) for c in range(self.size)
+                            if self.revealed[r][c] and self.grid[r][c] != MINE)
+        flags = sum(1 for r in range(self.size) for c in range(self.size) if self.flagged[r][c])
+        return revealed_safe, flags
+
+    def recount(self):
+        """Rebuild the live counters from the arrays (after bulk state changes)."""
+        self.revealed_safe, self.flags_placed = self.scan_counts()
+
+    def check_counters(self):
+        """Debug consistency check: live counters must match a full scan."""
+        expected = self.scan_counts()
+        if (self.revealed_safe, self.flags_placed) != expected:
+            raise AssertionError(
+                f"board counters out of sync: have {(self.revealed_safe, self.flags_placed)}, scan {expected}")
+
+    def to_lists(self):
+        """Plain-list (grid, revealed, flagged) for JSON saving."""
+        return self.grid, self.revealed, self.flagged
+
+    def set_planes(self, cells: bytes, revealed_bits: bytes, flagged_bits: bytes, generated: bool):
+        """Adopt packed planes (see planes.py), e.g. straight from a binary save."""
+        grid = cells_to_grid(cells, self.size)
+        mine_positions = [(r, c) for r, row in enumerate(grid) for c, v in enumerate(row) if v == MINE]
+        self.set_arrays(grid, bits_to_bools(revealed_bits, self.size),
+                        bits_to_bools(flagged_bits, self.size), mine_positions, generated)
+        self._packed_grid = bytes(cells)
+
+    def to_planes(self) -> Tuple[bytes, bytes, bytes]:
+        """
+        Packed (cells, revealed bits, flagged bits) for the binary save format.
+        Packing the int grid is the slow part and it only changes when mines are
+        placed, so it is packed once per deal; each call packs just the two bool planes.
+        """
+        grid, revealed, flagged = self.to_lists()
+        if self._packed_grid is None:
+            self._packed_grid = bytes(grid_to_cells(grid))
+        return self._packed_grid, bytes(bools_to_bits(revealed)), bytes(bools_to_bits(flagged))
 
     def generate(self, start_r: int, start_c: int):
         """Place mines randomly, avoiding the first-click cell and its neighbors for friendlier gameplay."""
+        if self.layout_provider is not None:
+            positions = self.layout_provider(self, start_r, start_c)
+            if positions is not None:
+                self.place_mines(positions)
+                return
+        n = self.size
+        self.place_mines([divmod(i, n) for i in sample_mines(self.rng, n, self.mines, start_r, start_c)])
+
+    def place_mines(self, positions):
+        """Build the board from a given mine layout; counts are accumulated around each mine."""
         self.reset_arrays()
-        # cells forbidden to place mine: start cell and its neighbors
-        forbidden = set()
-        for dr in (-1,0,1):
-            for dc in (-1,0,1):
-                nr, nc = start_r+dr, start_c+dc
-                if 0 <= nr < self.size and 0 <= nc < self.size:
-                    forbidden.add((nr, nc))
-        all_cells = [(r,c) for r in range(self.size) for c in range(self.size) if (r,c) not in forbidden]
-        # if mines >= available cells, fallback to full random excluding just start cell
-        if self.mines > len(all_cells):
-            all_cells = [(r,c) for r in range(self.size) for c in range(self.size) if not (r==start_r and c==start_c)]
-        self.mine_positions = list(self.rng.sample(all_cells, self.mines))
+        self.mine_positions = [tuple(p) for p in positions]
+        grid = self.grid
         for (r, c) in self.mine_positions:
-            self.grid[r][c] = MINE
-        # compute adjacent counts
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.grid[r][c] == MINE:
-                    continue
-                self.grid[r][c] = self.count_adjacent_mines(r, c)
+            grid[r][c] = MINE
+        for (r, c) in self.mine_positions:
+            for nr in (r-1, r, r+1):
+                for nc in (c-1, c, c+1):
+                    if 0 <= nr < self.size and 0 <= nc < self.size and grid[nr][nc] != MINE:
+                        grid[nr][nc] += 1
         self.generated = True
 
     def count_adjacent_mines(self, r:int, c:int) -> int:
@@ -143,36 +246,99 @@ class Board:
     def in_bounds(self, r:int, c:int) -> bool:
         return 0 <= r < self.size and 0 <= c < self.size
 
-    def reveal(self, r:int, c:int) -> List[Tuple[int,int]]:
+    def _rows(self):
+        """Per-row indexable (grid, revealed, flagged) used by the flood fill."""
+        return self.grid, self.revealed, self.flagged
+
+    def reveal(self, r:int, c:int, runs: bool = False) -> list:
         """
-        Reveal a cell and recursively reveal neighbors if it is zero.
-        Returns a list of coordinates that became revealed during this action.
+        Reveal a cell and flood-fill outwards if it is zero.
+        Returns the cells that became revealed during this action: (r, c) tuples, or with
+        runs=True row runs (row, col_start, col_end), col_end inclusive.
         If the board wasn't generated yet, generation happens with safe-first-click logic.
+
+        The fill is a scanline fill: each maximal row span of hidden zeros is revealed in
+        one pass and pushed once, then the rows above and below are scanned for the
+        numbered border and for new zero spans.
         """
         if not self.in_bounds(r,c):
             return []
         if not self.generated:
             self.generate(r, c)
-        if self.flagged[r][c] or self.revealed[r][c]:
+        grid, rev, flg = self._rows()
+        if flg[r][c] or rev[r][c]:
             return []   # nothing changed
-        revealed = []
-        # BFS/stack for flood-fill revealing zeros
-        stack = [(r,c)]
+        n = self.size
+        out = []   # row runs
+        if grid[r][c] != 0:
+            rev[r][c] = True
+            out.append((r, c, c))
+            self.revealed_safe += not self.is_mine(r, c)
+            return out if runs else [(r, c)]
+
+        def fill_span(sr, sc):
+            # hidden, unflagged zeros around (sr, sc) in row sr; reveal them and return the span
+            g, rv, fl = grid[sr], rev[sr], flg[sr]
+            lo = sc
+            while lo > 0 and g[lo-1] == 0 and not rv[lo-1] and not fl[lo-1]:
+                lo -= 1
+            hi = sc
+            while hi < n-1 and g[hi+1] == 0 and not rv[hi+1] and not fl[hi+1]:
+                hi += 1
+            for x in range(lo, hi+1):
+                rv[x] = True
+            return sr, lo, hi
+
+        count = 0
+        stack = [fill_span(r, c)]
         while stack:
-            cr, cc = stack.pop()
-            if not self.in_bounds(cr, cc):
-                continue
-            if self.revealed[cr][cc] or self.flagged[cr][cc]:
-                continue
-            self.revealed[cr][cc] = True
-            revealed.append((cr,cc))
-            if self.grid[cr][cc] == 0:
-                for dr in (-1,0,1):
-                    for dc in (-1,0,1):
-                        nr, nc = cr+dr, cc+dc
-                        if self.in_bounds(nr,nc) and not self.revealed[nr][nc] and not self.flagged[nr][nc]:
-                            stack.append((nr,nc))
-        return revealed
+            sr, zlo, zhi = stack.pop()
+            rv, fl = rev[sr], flg[sr]
+            # numbered cells closing the span in its own row
+            lo, hi = zlo, zhi
+            if lo > 0 and not rv[lo-1] and not fl[lo-1]:
+                rv[lo-1] = True
+                lo -= 1
+            if hi < n-1 and not rv[hi+1] and not fl[hi+1]:
+                rv[hi+1] = True
+                hi += 1
+            out.append((sr, lo, hi))
+            count += hi - lo + 1
+            for nr in (sr-1, sr+1):
+                if not 0 <= nr < n:
+                    continue
+                g, rv, fl = grid[nr], rev[nr], flg[nr]
+                x, end = max(zlo-1, 0), min(zhi+1, n-1)
+                run_start = -1
+                while x <= end:
+                    if rv[x] or fl[x]:
+                        pass
+                    elif g[x] == 0:
+                        span = fill_span(nr, x)
+                        stack.append(span)
+                        if run_start >= 0:
+                            out.append((nr, run_start, x-1))
+                            count += x - run_start
+                            run_start = -1
+                        x = span[2] + 1
+                        continue
+                    else:
+                        rv[x] = True
+                        if run_start < 0:
+                            run_start = x
+                        x += 1
+                        continue
+                    if run_start >= 0:
+                        out.append((nr, run_start, x-1))
+                        count += x - run_start
+                        run_start = -1
+                    x += 1
+                if run_start >= 0:
+                    out.append((nr, run_start, x-1))
+                    count += x - run_start
+        # zeros never have mine neighbors, so everything revealed here is safe
+        self.revealed_safe += count
+        return out if runs else runs_to_cells(out)
 
     def toggle_flag(self, r:int, c:int):
         if not self.in_bounds(r,c):
@@ -180,20 +346,20 @@ class Board:
         if self.revealed[r][c]:
             return
         self.flagged[r][c] = not self.flagged[r][c]
+        self.flags_placed += 1 if self.flagged[r][c] else -1
 
     def is_mine(self, r:int, c:int) -> bool:
         return self.in_bounds(r,c) and self.grid[r][c] == MINE
 
     def all_safe_revealed(self) -> bool:
         """Victory: every non-mine cell is revealed."""
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.grid[r][c] != MINE and not self.revealed[r][c]:
-                    return False
-        return True
+        if self.debug:
+            self.check_counters()
+        return self.revealed_safe >= self.size*self.size - self.mines
 
     def reveal_all_mines(self) -> List[Tuple[int,int]]:
         """Mark all mines as revealed and return list of positions"""
+        # mines don't count towards revealed_safe, so the counters are unchanged
         revealed = []
         for (r,c) in self.mine_positions:
             if not self.revealed[r][c]:
@@ -203,5 +369,6 @@ class Board:
 
     def remaining_flags(self) -> int:
         """Number of flags remaining (for UI)."""
-        placed = sum(1 for r in range(self.size) for c in range(self.size) if self.flagged[r][c])
-        return max(0, self.mines - placed)
+        if self.debug:
+            self.check_counters()
+        return max(0, self.mines - self.flags_placed)
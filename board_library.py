@@ -0,0 +1,123 @@
+# board_library.py
+"""
+Seed-addressable library of generated mine layouts.
+
+A seeded game deals the same board for the same (size, mines, seed, first click),
+so the layout only has to be generated once. BoardLibrary keeps layouts in a
+bounded in-memory LRU and, optionally, in an on-disk dbm index that persists across
+runs. The index is single-writer: dbm has no cross-process locking (gdbm refuses a
+second writer, dbm.dumb silently corrupts), so only one process may open a given path.
+
+With Game.library set, seeded games install `library.provider(seed, ...)` as the
+board's layout_provider, so Board.generate picks layouts up transparently; a miss
+runs the board's normal generation and stores the result.
+
+Daily challenge boards use daily_seed(), so everybody playing a difficulty on a
+given day gets the same board; prewarm() generates it for every first click ahead
+of time.
+"""
+import dbm
+import hashlib
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, List, Optional, Tuple
+
+from board import Board, sample_mines
+
+Cell = Tuple[int,int]
+Key = Tuple[int,int,int,int,int,str]
+
+def daily_seed(day: date = None, salt: str = "daily") -> int:
+    """Seed shared by everybody for the given day (default: today); fits a signed 64-bit column."""
+    day = day or date.today()
+    digest = hashlib.sha256(f"{salt}:{day.isoformat()}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big') & ((1 << 63) - 1)
+
+class BoardLibrary:
+    def __init__(self, max_entries: int = 4096, path: str = None):
+        """path: optional dbm file used as a persistent second level behind the LRU (one process per path)."""
+        self.max_entries = int(max_entries)
+        self._lru: "OrderedDict[Key, array]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = dbm.open(path, 'c') if path else None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _db_key(key: Key) -> bytes:
+        return ':'.join(map(str, key)).encode()
+
+    def get(self, key: Key) -> Optional[List[Cell]]:
+        with self._lock:
+            flat = self._lru.get(key)
+            if flat is not None:
+                self._lru.move_to_end(key)
+            elif self._db is not None:
+                raw = self._db.get(self._db_key(key))
+                if raw is not None:
+                    flat = array('I')
+                    flat.frombytes(raw)
+                    self._remember(key, flat)
+            if flat is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        n = key[0]
+        return [divmod(i, n) for i in flat]
+
+    def put(self, key: Key, layout: List[Cell]):
+        n = key[0]
+        flat = array('I', (r*n + c for (r, c) in layout))
+        with self._lock:
+            self._remember(key, flat)
+            if self._db is not None:
+                self._db[self._db_key(key)] = flat.tobytes()
+
+    def _remember(self, key: Key, flat: array):
+        self._lru[key] = flat
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def provider(self, seed: int, inner: Callable = None) -> Callable:
+        """
+        Board.layout_provider serving layouts for `seed`. `inner` is the provider the
+        board had before (e.g. no_guess.seeded_provider); it becomes part of the key.
+        """
+        variant = getattr(inner, '__name__', '') if inner is not None else ''
+
+        def library_provider(board, start_r: int, start_c: int) -> Optional[List[Cell]]:
+            key = (board.size, board.mines, seed, start_r, start_c, variant)
+            layout = self.get(key)
+            if layout is None:
+                # draw exactly what the board would without the library; it places the result once
+                layout = inner(board, start_r, start_c) if inner is not None else None
+                if layout is None:
+                    n = board.size
+                    layout = [divmod(i, n) for i in sample_mines(board.rng, n, board.mines, start_r, start_c)]
+                # a no-guess provider that gave up leaves board.guess_free False; don't serve that again
+                if board.guess_free is not False:
+                    self.put(key, layout)
+            return layout
+        return library_provider
+
+    def prewarm(self, size: int, mines: int, seed: int, starts: List[Cell] = None) -> int:
+        """Generate the board for every first click (or just `starts`); returns how many were new."""
+        made = 0
+        for (r, c) in starts or [(r, c) for r in range(size) for c in range(size)]:
+            if self.get((size, mines, seed, r, c, '')) is not None:
+                continue
+            board = Board(size, mines, random.Random(seed))
+            board.generate(r, c)
+            self.put((size, mines, seed, r, c, ''), board.mine_positions)
+            made += 1
+        return made
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,304 @@
+# chunked_board.py
+"""
+Endless ("infinite") board split into fixed-size square chunks.
+- size: chunk width/height
+- mines: mines per chunk
+- rng: only used once, to draw the board seed, so Game(seed=...) stays reproducible
+- max_cascade: most cells one reveal opens (see reveal)
+
+A chunk's mine layout is derived from (board seed, chunk row, chunk col) and is
+generated the first time a reveal, flood fill or neighbor count touches it.
+Layouts are a bounded LRU cache and can be dropped at any time because they are
+regenerated identically on demand. Only chunks the player has revealed or
+flagged in hold per-cell state; untouched chunks cost no memory.
+
+Below roughly 9.5% mines per cell the zeros percolate: a zero region is infinite
+with positive probability, and close to that density finite ones get huge. So a
+flood fill stops after max_cascade cells. What it leaves hidden next to revealed
+zeros is provably safe, and clicking any of it carries the fill on from there.
+Endless boards cannot be saved: the save format holds one finite grid.
+"""
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Tuple
+import random
+
+from board import MINE, cells_to_runs
+
+class _Chunk:
+    """Player state of one chunk: revealed / flagged bytes, row-major."""
+    __slots__ = ('revealed', 'flagged', 'n_revealed', 'n_flagged')
+
+    def __init__(self, cells: int):
+        self.revealed = bytearray(cells)
+        self.flagged = bytearray(cells)
+        self.n_revealed = 0
+        self.n_flagged = 0
+
+class _PlaneView:
+    """board.grid / board.revealed / board.flagged style [r][c] access."""
+    def __init__(self, getter, setter=None):
+        self._getter = getter
+        self._setter = setter
+
+    def __getitem__(self, r: int):
+        return _RowView(self._getter, self._setter, r)
+
+class _RowView:
+    __slots__ = ('_getter', '_setter', '_r')
+
+    def __init__(self, getter, setter, r: int):
+        self._getter = getter
+        self._setter = setter
+        self._r = r
+
+    def __getitem__(self, c: int):
+        return self._getter(self._r, c)
+
+    def __setitem__(self, c: int, value):
+        if self._setter is None:
+            raise TypeError("this plane is read-only")
+        self._setter(self._r, c, value)
+
+class ChunkedBoard:
+    # when True, the O(1) counter queries are cross-checked against a full scan
+    debug: bool = False
+
+    def __init__(self, size: int = 16, mines: int = 40, rng: random.Random = random,
+                 max_layouts: int = 256, max_cascade: int = 10000):
+        self.size = int(size)
+        self.mines = int(mines)
+        if not 0 <= self.mines < self.size*self.size:
+            raise ValueError("mines per chunk must be smaller than the chunk area")
+        self.rng = rng
+        self.seed: int = rng.getrandbits(64)
+        self.max_layouts = int(max_layouts)
+        self.max_cascade = max(1, int(max_cascade))
+        self._layouts: "OrderedDict[Tuple[int,int], FrozenSet[int]]" = OrderedDict()
+        self._chunks: Dict[Tuple[int,int], _Chunk] = {}
+        self.start: Tuple[int,int] = None
+        self.generated: bool = False
+        self.revealed_safe: int = 0
+        self.flags_placed: int = 0
+        self.grid = _PlaneView(self.value)
+        # writable like the list engine's planes (History.undo); board counters are the caller's job
+        self.revealed = _PlaneView(self.is_revealed, self._set_revealed)
+        self.flagged = _PlaneView(self.is_flagged, self._set_flagged)
+
+    # -----------------------
+    # Layouts
+    # -----------------------
+    def _locate(self, r: int, c: int) -> Tuple[Tuple[int,int], int]:
+        s = self.size
+        return (r // s, c // s), (r % s) * s + (c % s)
+
+    def _layout(self, key: Tuple[int,int]) -> FrozenSet[int]:
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            return layout
+        layout = self._generate_layout(key)
+        self._layouts[key] = layout
+        if len(self._layouts) > self.max_layouts:
+            self._layouts.popitem(last=False)
+        return layout
+
+    def _generate_layout(self, key: Tuple[int,int]) -> FrozenSet[int]:
+        """Deterministic mine set for one chunk, keeping the first-click neighborhood clear."""
+        s = self.size
+        cr, cc = key
+        chunk_rng = random.Random(f"{self.seed}:{cr}:{cc}")
+        forbidden = set()
+        if self.start is not None:
+            sr, sc = self.start
+            for nr in (sr-1, sr, sr+1):
+                for nc in (sc-1, sc, sc+1):
+                    if (nr // s, nc // s) == key:
+                        forbidden.add((nr % s) * s + (nc % s))
+        candidates = [i for i in range(s*s) if i not in forbidden]
+        return frozenset(chunk_rng.sample(candidates, min(self.mines, len(candidates))))
+
+    def evict(self, r: int, c: int, radius: int = 4) -> int:
+        """
+        Drop cached layouts more than radius chunks away from cell (r,c).
+        Returns how many were dropped; they are regenerated on demand. Chunk state is
+        never dropped: a chunk is released as soon as nothing in it is revealed or flagged.
+        """
+        cr, cc = r // self.size, c // self.size
+        far = [k for k in self._layouts if max(abs(k[0] - cr), abs(k[1] - cc)) > radius]
+        for key in far:
+            del self._layouts[key]
+        return len(far)
+
+    # -----------------------
+    # Cell access
+    # -----------------------
+    def in_bounds(self, r: int, c: int) -> bool:
+        return True
+
+    def is_mine(self, r: int, c: int) -> bool:
+        key, i = self._locate(r, c)
+        return i in self._layout(key)
+
+    def count_adjacent_mines(self, r: int, c: int) -> int:
+        cnt = 0
+        for nr in (r-1, r, r+1):
+            for nc in (c-1, c, c+1):
+                if (nr != r or nc != c) and self.is_mine(nr, nc):
+                    cnt += 1
+        return cnt
+
+    def value(self, r: int, c: int) -> int:
+        """MINE (-1) or the adjacent mine count, like board.grid[r][c]."""
+        return MINE if self.is_mine(r, c) else self.count_adjacent_mines(r, c)
+
+    def is_revealed(self, r: int, c: int) -> bool:
+        key, i = self._locate(r, c)
+        ch = self._chunks.get(key)
+        return ch is not None and bool(ch.revealed[i])
+
+    def is_flagged(self, r: int, c: int) -> bool:
+        key, i = self._locate(r, c)
+        ch = self._chunks.get(key)
+        return ch is not None and bool(ch.flagged[i])
+
+    def _chunk(self, key: Tuple[int,int]) -> _Chunk:
+        ch = self._chunks.get(key)
+        if ch is None:
+            ch = self._chunks[key] = _Chunk(self.size*self.size)
+        return ch
+
+    def _set_revealed(self, r: int, c: int, value):
+        key, i = self._locate(r, c)
+        ch = self._chunk(key)
+        if bool(ch.revealed[i]) != bool(value):
+            ch.revealed[i] = 1 if value else 0
+            ch.n_revealed += 1 if value else -1
+        self._release(key, ch)
+
+    def _set_flagged(self, r: int, c: int, value):
+        key, i = self._locate(r, c)
+        ch = self._chunk(key)
+        if bool(ch.flagged[i]) != bool(value):
+            ch.flagged[i] = 1 if value else 0
+            ch.n_flagged += 1 if value else -1
+        self._release(key, ch)
+
+    def _release(self, key: Tuple[int,int], ch: _Chunk):
+        """Forget a chunk that no longer holds any player state."""
+        if not (ch.n_revealed or ch.n_flagged):
+            del self._chunks[key]
+
+    @property
+    def mine_positions(self) -> List[Tuple[int,int]]:
+        """Mines inside chunks the player has touched (the rest of the plane is unbounded)."""
+        s = self.size
+        out = []
+        for (cr, cc) in self._chunks:
+            for i in sorted(self._layout((cr, cc))):
+                out.append((cr*s + i // s, cc*s + i % s))
+        return out
+
+    # -----------------------
+    # Actions
+    # -----------------------
+    def generate(self, start_r: int, start_c: int):
+        """Fix the first-click cell; chunk layouts are then produced lazily around it."""
+        self.start = (start_r, start_c)
+        self._layouts.clear()   # anything cached before the first click ignored the safe zone
+        self.generated = True
+
+    def reveal(self, r: int, c: int, runs: bool = False) -> list:
+        """
+        Reveal a cell and flood-fill zeros across chunk borders. Returns newly revealed cells (or row runs).
+        At most max_cascade cells are opened; the rest of the region stays hidden (and safe) next to
+        revealed zeros, and revealing any of it continues the fill.
+        """
+        if not self.generated:
+            self.generate(r, c)
+        if self.is_flagged(r, c) or self.is_revealed(r, c):
+            return []
+        revealed = []
+        stack = [(r, c)]
+        while stack and len(revealed) < self.max_cascade:
+            cr, cc = stack.pop()
+            key, i = self._locate(cr, cc)
+            ch = self._chunk(key)
+            if ch.revealed[i] or ch.flagged[i]:
+                continue
+            ch.revealed[i] = 1
+            ch.n_revealed += 1
+            revealed.append((cr, cc))
+            if self.value(cr, cc) == 0:
+                for nr in (cr-1, cr, cr+1):
+                    for nc in (cc-1, cc, cc+1):
+                        if not self.is_revealed(nr, nc) and not self.is_flagged(nr, nc):
+                            stack.append((nr, nc))
+        self.revealed_safe += len(revealed) - self.is_mine(r, c)
+        return cells_to_runs(revealed) if runs else revealed
+
+    def toggle_flag(self, r: int, c: int):
+        if self.is_revealed(r, c):
+            return
+        key, i = self._locate(r, c)
+        ch = self._chunk(key)
+        ch.flagged[i] ^= 1
+        delta = 1 if ch.flagged[i] else -1
+        ch.n_flagged += delta
+        self.flags_placed += delta
+        self._release(key, ch)
+
+    def all_safe_revealed(self) -> bool:
+        """Endless mode has no win condition."""
+        return False
+
+    def reveal_all_mines(self) -> List[Tuple[int,int]]:
+        """Reveal the mines of every touched chunk (game over)."""
+        revealed = []
+        for (r, c) in self.mine_positions:
+            key, i = self._locate(r, c)
+            ch = self._chunks[key]
+            if not ch.revealed[i]:
+                ch.revealed[i] = 1
+                ch.n_revealed += 1
+                revealed.append((r, c))
+        return revealed
+
+    def remaining_flags(self) -> int:
+        """There is no global flag budget on an endless board."""
+        return 0
+
+    def scan_counts(self) -> Tuple[int,int]:
+        s = self.size
+        revealed_safe = flags = 0
+        for (cr, cc), ch in self._chunks.items():
+            layout = self._layout((cr, cc))
+            revealed_safe += sum(1 for i in range(s*s) if ch.revealed[i] and i not in layout)
+            flags += sum(ch.flagged)
+        return revealed_safe, flags
+
+    def check_counters(self):
+        expected = self.scan_counts()
+        if (self.revealed_safe, self.flags_placed) != expected:
+            raise AssertionError(
+                f"board counters out of sync: have {(self.revealed_safe, self.flags_placed)}, scan {expected}")
+
+    def loaded_chunks(self) -> int:
+        """Chunks holding player state (for memory monitoring)."""
+        return len(self._chunks)
+
+    # -----------------------
+    # Saving
+    # -----------------------
+    # Game.get_state / load_state (save files, the journal, autosave) need one finite
+    # grid; ValueError is what their callers already report as an unusable save.
+    def to_lists(self):
+        raise ValueError("endless (chunked) boards cannot be saved")
+
+    def to_planes(self):
+        raise ValueError("endless (chunked) boards cannot be saved")
+
+    def set_arrays(self, grid, revealed, flagged, mine_positions, generated: bool):
+        raise ValueError("saves cannot be loaded into an endless (chunked) board")
+
+    def set_planes(self, cells, revealed_bits, flagged_bits, generated: bool):
+        raise ValueError("saves cannot be loaded into an endless (chunked) board")
@@ -0,0 +1,172 @@
+# cli.py
+"""
+Terminal entry point. Only the game core is imported up front; tkinter (gui),
+the solver (hints) and the journal are imported when a command needs them, so
+headless workers start quickly.
+
+    python cli.py play --difficulty Hard --seed 7      # play in the terminal
+    python cli.py verify "minesweeper save.txt"        # check a save file, exit 1 if broken
+    python cli.py replay games/run1 --verify           # rebuild a journaled game (read-only)
+    python cli.py gui                                  # the Tk app (same as python main.py)
+"""
+import argparse
+import sys
+
+from board import MINE
+from game_logic import Game, DIFFICULTIES
+import file_manager
+
+def render(game: Game, show_mines: bool = False) -> str:
+    """Text board: '#' hidden, 'F' flag, '*' mine, '.' empty, digits for counts."""
+    b = game.board
+    n = b.size
+    width = len(str(n - 1))
+    lines = [' ' * (width + 1) + ' '.join(str(c % 10) for c in range(n))]
+    for r in range(n):
+        row = []
+        for c in range(n):
+            if b.flagged[r][c] and not b.revealed[r][c]:
+                row.append('F')
+            elif b.revealed[r][c] or (show_mines and b.generated and b.grid[r][c] == MINE):
+                v = b.grid[r][c]
+                row.append('*' if v == MINE else '.' if v == 0 else str(v))
+            else:
+                row.append('#')
+        lines.append(f"{r:>{width}} " + ' '.join(row))
+    return '\n'.join(lines)
+
+def _parse_difficulty(name: str):
+    if name in DIFFICULTIES:
+        return DIFFICULTIES[name]
+    size, mines = name.lower().split('x')
+    return int(size), int(mines)
+
+# -----------------------
+# Commands
+# -----------------------
+def cmd_play(args) -> int:
+    size, mines = _parse_difficulty(args.difficulty)
+    game = Game(size=size, mines=mines, seed=args.seed, engine=args.engine)
+    from history import History
+    game.history = History()
+    solver = None
+    print("commands: R C reveal | f R C flag | h hint | u undo | s [file] save | q quit")
+    while True:
+        print(render(game, show_mines=game.game_over))
+        if game.game_over:
+            print("You win!" if game.win else "Boom! Game over.")
+            return 0
+        print(f"flags left: {game.board.remaining_flags()}")
+        try:
+            words = input("> ").split()
+        except EOFError:
+            return 0
+        if not words:
+            continue
+        try:
+            if words[0] == 'q':
+                return 0
+            if words[0] == 'f':
+                game.right_click(int(words[1]), int(words[2]))
+            elif words[0] == 'h':
+                from solver import Solver
+                if solver is None:
+                    solver = Solver(game.board)
+                cell = solver.hint()
+                if cell is None:
+                    print("no cell can be proven safe, time to guess")
+                    continue
+                print(f"hint: {cell[0]} {cell[1]}")
+                solver.update(game.left_click(*cell)['revealed'])
+            elif words[0] == 'u':
+                if game.undo() is None:
+                    print("nothing to undo")
+                    continue
+                solver = None
+            elif words[0] == 's':
+                try:
+                    file_manager.save_game(game.get_state(planes=True),
+                                           words[1] if len(words) > 1 else file_manager.SAVE_FILENAME)
+                except (OSError, ValueError) as e:
+                    print(f"not saved: {e}")
+                    continue
+                print("saved")
+            else:
+                r, c = int(words[0]), int(words[1])
+                if not game.board.in_bounds(r, c):
+                    print("out of bounds")
+                    continue
+                revealed = game.left_click(r, c)['revealed']
+                if solver is not None:
+                    solver.update(revealed)
+        except (ValueError, IndexError):
+            print("?")
+
+def _report(game: Game, label: str) -> int:
+    problems = game.verify()
+    b = game.board
+    status = ("won" if game.win else "lost") if game.game_over else "in progress"
+    print(f"{label}: {b.size}x{b.size}, {b.mines} mines, {status}, "
+          f"{b.revealed_safe} safe cells revealed, {b.flags_placed} flags")
+    for p in problems:
+        print(f"  problem: {p}")
+    return 1 if problems else 0
+
+def cmd_verify(args) -> int:
+    status = 0
+    for path in args.files:
+        try:
+            state = file_manager.load_game(path)
+            game = Game(engine=args.engine)
+            game.load_state(state)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"{path}: unreadable ({e})")
+            status = 1
+            continue
+        status |= _report(game, path)
+        if args.show:
+            print(render(game))
+    return status
+
+def cmd_replay(args) -> int:
+    import journal
+    game, moves = journal.replay(args.base, engine=args.engine)
+    print(f"{args.base}: replayed {moves} moves after the latest snapshot")
+    if args.show:
+        print(render(game))
+    return _report(game, args.base) if args.verify else 0
+
+def cmd_gui(args) -> int:
+    import main   # tkinter is only imported here
+    main.run()
+    return 0
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Minesweeper command line")
+    ap.add_argument('--engine', default=None, help="board engine (see game_logic.ENGINES)")
+    sub = ap.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('play', help="play in the terminal")
+    p.add_argument('--difficulty', default='Easy', help="difficulty name or SIZExMINES")
+    p.add_argument('--seed', type=int, default=None)
+    p.set_defaults(func=cmd_play)
+
+    p = sub.add_parser('verify', help="check save files for consistency")
+    p.add_argument('files', nargs='+')
+    p.add_argument('--show', action='store_true', help="print the board")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser('replay', help="rebuild a journaled game without modifying it")
+    p.add_argument('base', help="journal base path")
+    p.add_argument('--verify', action='store_true', help="also check the rebuilt state")
+    p.add_argument('--show', action='store_true', help="print the board")
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser('gui', help="start the Tk app")
+    p.set_defaults(func=cmd_gui)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
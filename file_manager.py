@@ -17,25 +17,146 @@
 #     return state
 # file_manager.py
 """
-Save/load helper. Saves a JSON file that includes a base64-pickled RNG state so reloads
-are reproducible.
+Save/load helper. Saves use a versioned binary format; old JSON saves still load.
+
+Binary format, little-endian:
+  header    '<4sHHII'  magic b'MSWB', format version, flags, size, mines
+  cells     (size*size + 1)//2 bytes, 4 bits per cell (see planes.py)
+  revealed  (size*size + 7)//8 bytes bitset
+  flagged   (size*size + 7)//8 bytes bitset
+  rng       only if FLAG_RNG: '<I625I' Mersenne Twister version + 625 state words,
+            then '<Bd' has-gauss_next + gauss_next
+load_game mmaps the file and hands the packed planes to Game.load_state as-is, so
+no per-cell Python objects are built unless the board engine wants them.
+
+Compressed saves are b'MSWZ' followed by the zlib-compressed binary save.
+Every save is written to a temp file and renamed over the target, so a crash
+mid-write leaves the previous save intact.
 """
-import json, pickle, base64
+import mmap, os, struct, zlib
 from typing import Dict, Any
 
+from planes import grid_to_cells, bools_to_bits
+
 SAVE_FILENAME = "minesweeper save.txt"
 
-def save_game(state: Dict[str, Any], filename: str = SAVE_FILENAME):
-    data = dict(state)
-    # pickle RNG state (it is a tuple) and base64 encode so JSON-friendly
-    if 'rng_state' in data:
-        data['rng_state'] = base64.b64encode(pickle.dumps(data['rng_state'])).decode('ascii')
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+MAGIC = b'MSWB'
+MAGIC_COMPRESSED = b'MSWZ'
+FORMAT_VERSION = 1
+FLAG_GENERATED, FLAG_GAME_OVER, FLAG_WIN, FLAG_RNG = 1, 2, 4, 8
+_HEADER = struct.Struct('<4sHHII')
+_RNG_WORDS = struct.Struct('<I625I')
+_RNG_GAUSS = struct.Struct('<Bd')
+
+def encode_state(state: Dict[str, Any], compress: bool = False) -> bytes:
+    """A Game.get_state() dict (list or planes form) as the bytes of a save file."""
+    size, mines = int(state['size']), int(state['mines'])
+    if 'cells' in state:
+        cells, revealed_bits, flagged_bits = state['cells'], state['revealed_bits'], state['flagged_bits']
+    else:
+        cells = grid_to_cells(state['grid'])
+        revealed_bits = bools_to_bits(state['revealed'])
+        flagged_bits = bools_to_bits(state['flagged'])
+    flags = 0
+    if state.get('generated', True):
+        flags |= FLAG_GENERATED
+    if state.get('game_over', False):
+        flags |= FLAG_GAME_OVER
+    if state.get('win', False):
+        flags |= FLAG_WIN
+    rng_state = state.get('rng_state')
+    if rng_state is not None:
+        flags |= FLAG_RNG
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, flags, size, mines), cells, revealed_bits, flagged_bits]
+    if rng_state is not None:
+        version, words, gauss_next = rng_state
+        parts.append(_RNG_WORDS.pack(version, *words))
+        parts.append(_RNG_GAUSS.pack(gauss_next is not None, gauss_next or 0.0))
+    data = b"".join(parts)
+    if compress:
+        # level 1: the planes of a large board are mostly runs, fast settings already shrink them well
+        data = MAGIC_COMPRESSED + zlib.compress(data, 1)
+    return data
+
+def write_atomic(filename: str, data: bytes, fsync: bool = False):
+    """Write data to filename + '.tmp', then rename it over filename."""
+    tmp = filename + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, filename)
+
+def save_game(state: Dict[str, Any], filename: str = SAVE_FILENAME, compress: bool = False, fsync: bool = False):
+    """Write a Game.get_state() dict (list or planes form) in the binary format."""
+    write_atomic(filename, encode_state(state, compress), fsync)
 
 def load_game(filename: str = SAVE_FILENAME) -> Dict[str, Any]:
-    with open(filename, 'r', encoding='utf-8') as f:
-        raw = json.load(f)
+    """Load a save in any format; binary saves come back in Game.get_state(planes=True) form."""
+    with open(filename, 'rb') as f:
+        magic = f.read(len(MAGIC))
+        if magic == MAGIC_COMPRESSED:
+            return decode_state(magic + f.read())
+        if magic != MAGIC:
+            f.seek(0)
+            return _load_json(f.read().decode('utf-8'))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _read_binary(mm)
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    """Inverse of encode_state (binary formats only)."""
+    if data[:len(MAGIC_COMPRESSED)] == MAGIC_COMPRESSED:
+        try:
+            data = zlib.decompress(data[len(MAGIC_COMPRESSED):])
+        except zlib.error as e:
+            raise ValueError(f"corrupt compressed save: {e}") from None
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary save")
+    return _read_binary(data)
+
+def _read_binary(buf) -> Dict[str, Any]:
+    if len(buf) < _HEADER.size:
+        raise ValueError("truncated save file")
+    magic, version, flags, size, mines = _HEADER.unpack_from(buf, 0)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"save format version {version} is newer than supported ({FORMAT_VERSION})")
+    cells_len = (size*size + 1) // 2
+    bits_len = (size*size + 7) // 8
+    end = _HEADER.size + cells_len + 2*bits_len
+    if flags & FLAG_RNG:
+        end += _RNG_WORDS.size + _RNG_GAUSS.size
+    if len(buf) < end:
+        raise ValueError("truncated save file")
+    pos = _HEADER.size
+    state = {
+        'size': size,
+        'mines': mines,
+        'cells': buf[pos:pos + cells_len],
+        'revealed_bits': buf[pos + cells_len:pos + cells_len + bits_len],
+        'flagged_bits': buf[pos + cells_len + bits_len:pos + cells_len + 2*bits_len],
+        'generated': bool(flags & FLAG_GENERATED),
+        'game_over': bool(flags & FLAG_GAME_OVER),
+        'win': bool(flags & FLAG_WIN),
+    }
+    if flags & FLAG_RNG:
+        pos += cells_len + 2*bits_len
+        version, *words = _RNG_WORDS.unpack_from(buf, pos)
+        has_gauss, gauss_next = _RNG_GAUSS.unpack_from(buf, pos + _RNG_WORDS.size)
+        state['rng_state'] = (version, tuple(words), gauss_next if has_gauss else None)
+    return state
+
+def _load_json(text: str) -> Dict[str, Any]:
+    # legacy format only: keep json/pickle out of the import cost of every process
+    import base64, io, json, pickle
+
+    class _StateUnpickler(pickle.Unpickler):
+        """Legacy RNG states are plain tuples of numbers; refuse anything that imports code."""
+        def find_class(self, module, name):
+            raise pickle.UnpicklingError(f"global '{module}.{name}' is not allowed in a save file")
+
+    raw = json.loads(text)
     if 'rng_state' in raw:
-        raw['rng_state'] = pickle.loads(base64.b64decode(raw['rng_state'].encode('ascii')))
+        blob = base64.b64decode(raw['rng_state'].encode('ascii'))
+        raw['rng_state'] = _StateUnpickler(io.BytesIO(blob)).load()
     return raw
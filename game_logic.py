@@ -53,30 +53,91 @@
 #         self.random.setstate(state["rng_state"])
 
 # game_logic.py
-from board import Board
+from board import Board, MINE, runs_to_cells
+import importlib
 import random
 from typing import Dict, Any, Tuple, List
 
+# board engines by name: "module:Class", imported on first use so optional
+# dependencies (numpy) are only needed when that engine is selected
+ENGINES = {
+    'list': 'board:Board',
+    'numpy': 'numpy_board:NumpyBoard',
+    'packed': 'packed_board:PackedBoard',      # bit-packed, smallest per-game footprint
+    'chunked': 'chunked_board:ChunkedBoard',   # endless mode: size/mines are per chunk
+}
+
+# engines with one finite board (all but endless mode)
+FINITE_ENGINES = [name for name in ENGINES if name != 'chunked']
+
+# standard difficulties: name -> (size, mines)
+DIFFICULTIES = {
+    'Easy': (9, 10),
+    'Medium': (16, 40),
+    'Hard': (22, 99),
+}
+
+def board_class(engine=None):
+    """Resolve an engine name (or a Board subclass) to a Board class."""
+    if engine is None:
+        return Board
+    if isinstance(engine, type):
+        return engine
+    if engine not in ENGINES:
+        raise ValueError(f"unknown board engine: {engine!r}")
+    module_name, cls_name = ENGINES[engine].split(':')
+    return getattr(importlib.import_module(module_name), cls_name)
+
+def available_engines(names=None) -> List[str]:
+    """Engines (default: the finite ones) whose optional dependencies are installed."""
+    out = []
+    for name in names or FINITE_ENGINES:
+        try:
+            board_class(name)
+        except ImportError:
+            continue
+        out.append(name)
+    return out
+
 class Game:
     """
     Orchestrates Board + RNG state + high level actions.
+    engine selects the Board implementation ('list' default, 'numpy' for large boards,
+    'packed' for a small memory footprint, 'chunked' for endless boards).
+    no_guess=True only deals boards that can be cleared from the first click by logic (see no_guess.py).
+    Set Game.library to a board_library.BoardLibrary to share generated layouts between seeded games.
     """
-    def __init__(self, size:int=9, mines:int=10, seed: int = None, rng_state=None):
+    __slots__ = ('random', 'engine', 'no_guess', 'board', 'game_over', 'win', 'start_time', 'journal',
+                 'history')
+    library = None   # optional board_library.BoardLibrary consulted by seeded games
+
+    def __init__(self, size:int=9, mines:int=10, seed: int = None, rng_state=None, engine=None,
+                 no_guess: bool = False):
         self.random = random.Random()
         if seed is not None:
             self.random.seed(seed)
         if rng_state is not None:
             # assume valid random.getstate() object
             self.random.setstate(rng_state)
-        self.board = Board(size=size, mines=mines, rng=self.random)
+        self.engine = engine
+        self.no_guess = no_guess
+        self.board = board_class(engine)(size=size, mines=mines, rng=self.random)
+        if no_guess:
+            import no_guess as ng
+            self.board.layout_provider = ng.provider if seed is None and rng_state is None else ng.seeded_provider
+        if self.library is not None and seed is not None and rng_state is None and hasattr(self.board, 'layout_provider'):
+            self.board.layout_provider = self.library.provider(seed, self.board.layout_provider)
         self.game_over: bool = False
         self.win: bool = False
         self.start_time = None   # can be set by UI to track elapsed seconds
+        self.journal = None      # optional journal.Journal recording every move
+        self.history = None      # optional history.History for undo/redo
 
-    def left_click(self, r:int, c:int) -> Dict[str, Any]:
+    def left_click(self, r:int, c:int, runs: bool = False) -> Dict[str, Any]:
         """
         Returns a dict with:
-          - 'revealed': list[(r,c)] newly revealed
+          - 'revealed': list[(r,c)] newly revealed, or with runs=True
+            list[(row, col_start, col_end)] row runs (see board.runs_to_cells)
           - 'hit_mine': bool if user clicked a mine
           - 'win': bool if this move caused win
           - 'game_over': bool overall game over
@@ -84,13 +145,16 @@ class Game:
         result = {'revealed':[], 'hit_mine':False, 'win':False, 'game_over':False}
         if self.game_over:
             return result
+        before = self.history.before_move(self) if self.history is not None else None
         # reveal - board.generate is triggered inside reveal for first-click safety
-        newly = self.board.reveal(r,c)
-        result['revealed'] = newly
-        if self.board.is_mine(r,c):
+        newly = self.board.reveal(r, c, runs=True)
+        result['revealed'] = newly if runs else runs_to_cells(newly)
+        exploded = ()
+        # nothing revealed: the cell was flagged or already open, so it cannot be a hit
+        if newly and self.board.is_mine(r,c):
             # hit mine: reveal all mines; game over
             result['hit_mine'] = True
-            self.board.reveal_all_mines()
+            exploded = self.board.reveal_all_mines()
             self.game_over = True
             self.win = False
             result['game_over'] = True
@@ -99,6 +163,10 @@ class Game:
             self.win = True
             result['win'] = True
             result['game_over'] = True
+        if self.history is not None:
+            self.history.record(before, 'L', r, c, newly, exploded)
+        if self.journal is not None:
+            self.journal.record(self, 'L', r, c)
         return result
 
     def right_click(self, r:int, c:int) -> Dict[str, Any]:
@@ -107,35 +175,123 @@ class Game:
         """
         if self.game_over:
             return {'flagged': False, 'remaining_flags': self.board.remaining_flags()}
+        before = self.history.before_move(self) if self.history is not None else None
         self.board.toggle_flag(r,c)
-        return {'flagged': self.board.flagged[r][c], 'remaining_flags': self.board.remaining_flags()}
+        if self.history is not None:
+            self.history.record(before, 'R', r, c)
+        if self.journal is not None:
+            self.journal.record(self, 'R', r, c)
+        return {'flagged': bool(self.board.flagged[r][c]), 'remaining_flags': self.board.remaining_flags()}
+
+    def apply_moves(self, moves, outcomes: bool = True) -> Dict[str, Any]:
+        """
+        Apply ('L' | 'R', r, c) moves in order, stopping after the first one that ends the game.
+        Any other kind raises ValueError; the moves before it stay applied.
+        Returns one merged delta:
+          - 'applied': number of moves applied
+          - 'revealed': row runs (row, col_start, col_end) revealed by all of them
+          - 'mines': mines uncovered by a loss
+          - 'flags': [(r, c, flagged)] for cells whose flag ended up changed
+          - 'outcomes': per move, cells revealed ('L') or the new flag state ('R'); None if outcomes=False
+          - 'hit_mine', 'win', 'game_over' as in left_click
+        """
+        board = self.board
+        reveal, toggle_flag = board.reveal, board.toggle_flag
+        history, journal = self.history, self.journal
+        runs: List[Tuple[int,int,int]] = []
+        toggled = set()
+        per_move = [] if outcomes else None
+        exploded = ()
+        applied = 0
+        hit = False
+        for kind, r, c in moves:
+            if self.game_over:
+                break
+            before = history.before_move(self) if history is not None else None
+            if kind == 'L':
+                newly = reveal(r, c, runs=True)
+                lost = ()
+                if newly:
+                    runs.extend(newly)
+                    if board.is_mine(r, c):
+                        exploded = lost = board.reveal_all_mines()
+                        hit = True
+                        self.game_over = True
+                        self.win = False
+                    elif board.all_safe_revealed():
+                        self.game_over = True
+                        self.win = True
+                if per_move is not None:
+                    per_move.append(sum(hi - lo + 1 for (_, lo, hi) in newly))
+                if history is not None:
+                    history.record(before, 'L', r, c, newly, lost)
+            elif kind == 'R':
+                placed = board.flags_placed
+                toggle_flag(r, c)
+                if board.flags_placed != placed:
+                    toggled ^= {(r, c)}
+                if per_move is not None:
+                    per_move.append(bool(board.flagged[r][c]))
+                if history is not None:
+                    history.record(before, 'R', r, c)
+            else:
+                raise ValueError(f"unknown move kind: {kind!r}")
+            if journal is not None:
+                journal.record(self, kind, r, c)
+            applied += 1
+        flagged = board.flagged
+        return {
+            'applied': applied,
+            'revealed': runs,
+            'mines': list(exploded),
+            'flags': [(r, c, bool(flagged[r][c])) for (r, c) in toggled],
+            'outcomes': per_move,
+            'hit_mine': hit,
+            'win': self.win,
+            'game_over': self.game_over,
+        }
+
+    def undo(self):
+        """Undo the last move (needs self.history); returns the cells whose display changed, or None."""
+        return self.history.undo(self) if self.history is not None else None
+
+    def redo(self):
+        """Redo the last undone move; returns its left/right click result, or None."""
+        return self.history.redo(self) if self.history is not None else None
 
     def new_game(self, size:int, mines:int, seed: int = None):
-        self.__init__(size=size, mines=mines, seed=seed)
+        self.__init__(size=size, mines=mines, seed=seed, engine=self.engine, no_guess=self.no_guess)
 
-    def get_state(self) -> Dict[str, Any]:
-        """Serialize state for saving. RNG state pickled by file_manager."""
-        return {
+    def get_state(self, planes: bool = False) -> Dict[str, Any]:
+        """
+        Serialize state for saving.
+        planes=True stores the board as packed 'cells' / 'revealed_bits' / 'flagged_bits'
+        (see planes.py) instead of nested lists; that is what the binary save format writes.
+        """
+        state = {
             'size': self.board.size,
             'mines': self.board.mines,
-            'grid': self.board.grid,
-            'revealed': self.board.revealed,
-            'flagged': self.board.flagged,
-            'mine_positions': self.board.mine_positions,
             'generated': self.board.generated,
             'game_over': self.game_over,
             'win': self.win,
             'rng_state': self.random.getstate()
         }
+        if planes:
+            state['cells'], state['revealed_bits'], state['flagged_bits'] = self.board.to_planes()
+        else:
+            state['grid'], state['revealed'], state['flagged'] = self.board.to_lists()
+            state['mine_positions'] = self.board.mine_positions
+        return state
 
     def load_state(self, state: Dict[str,Any]):
         self.board.size = int(state.get('size', self.board.size))
         self.board.mines = int(state.get('mines', self.board.mines))
-        self.board.grid = state['grid']
-        self.board.revealed = state['revealed']
-        self.board.flagged = state['flagged']
-        self.board.mine_positions = state.get('mine_positions', [])
-        self.board.generated = state.get('generated', True)
+        if 'cells' in state:
+            self.board.set_planes(state['cells'], state['revealed_bits'], state['flagged_bits'],
+                                  state.get('generated', True))
+        else:
+            self.board.set_arrays(state['grid'], state['revealed'], state['flagged'],
+                                  state.get('mine_positions', []), state.get('generated', True))
         self.game_over = state.get('game_over', False)
         self.win = state.get('win', False)
         rng_state = state.get('rng_state', None)
@@ -143,3 +299,46 @@ class Game:
             self.random.setstate(rng_state)
         # ensure board.rng points to this game's RNG
         self.board.rng = self.random
+
+    def verify(self) -> List[str]:
+        """
+        Consistency check of a (loaded or replayed) game; returns a list of problems,
+        empty if the state is one real play could have produced.
+        """
+        b = self.board
+        problems = []
+        grid, revealed, flagged = b.to_lists()
+        n = b.size
+        mines = {(r, c) for r in range(n) for c in range(n) if grid[r][c] == MINE}
+        if not b.generated:
+            if any(revealed[r][c] for r in range(n) for c in range(n)):
+                problems.append("cells revealed before the board was generated")
+            return problems
+        if len(mines) != b.mines:
+            problems.append(f"board holds {len(mines)} mines, expected {b.mines}")
+        for r in range(n):
+            for c in range(n):
+                if (r, c) in mines:
+                    continue
+                count = sum((nr, nc) in mines for nr in (r-1, r, r+1) for nc in (c-1, c, c+1))
+                if grid[r][c] != count:
+                    problems.append(f"cell ({r},{c}) shows {grid[r][c]} but has {count} adjacent mines")
+                    break
+        lost = self.game_over and not self.win
+        # a lost game shows every mine, flagged ones included
+        if any(revealed[r][c] and flagged[r][c] and not (lost and (r, c) in mines)
+               for r in range(n) for c in range(n)):
+            problems.append("cells both revealed and flagged")
+        if (b.revealed_safe, b.flags_placed) != b.scan_counts():
+            problems.append("board counters out of sync with the cells")
+        exploded = any(revealed[r][c] for (r, c) in mines)
+        cleared = b.scan_counts()[0] == n*n - len(mines)
+        if exploded and (not self.game_over or self.win):
+            problems.append("a mine is revealed but the game is not lost")
+        if self.win and not cleared:
+            problems.append("game marked won with safe cells still hidden")
+        if cleared and not exploded and not (self.game_over and self.win):
+            problems.append("every safe cell is revealed but the game is not won")
+        if self.game_over and not self.win and not exploded:
+            problems.append("game marked lost without a revealed mine")
+        return problems
@@ -0,0 +1,104 @@
+# history.py
+"""
+Multi-level undo/redo for Game.
+
+Each move is stored as a delta: the row runs it revealed, the mines shown on a loss,
+the board counters and game flags from before the move, and (for the move that
+generated the board) the RNG state, so undoing it also undoes the mine placement
+and redoing it deals the same board. Memory grows with cells changed, not with
+board size x moves.
+
+Redo replays the move through Game, which is deterministic given the restored state.
+"""
+from collections import deque
+from typing import List, Optional, Tuple
+
+Cell = Tuple[int,int]
+
+class Move:
+    __slots__ = ('kind', 'r', 'c', 'runs', 'exploded', 'before', 'rng_state')
+
+    def __init__(self, kind: str, r: int, c: int, runs, exploded, before, rng_state):
+        self.kind = kind            # 'L' or 'R'
+        self.r = r
+        self.c = c
+        self.runs = runs            # (row, col_start, col_end) revealed by a left click
+        self.exploded = exploded    # mines shown by reveal_all_mines on a loss
+        self.before = before        # (revealed_safe, flags_placed, game_over, win)
+        self.rng_state = rng_state  # (rng state, flags) only for the move that generated the board
+
+class History:
+    def __init__(self, limit: int = None):
+        """limit: maximum undo depth (None = unlimited); the oldest moves are dropped first."""
+        self.undo_stack: deque = deque(maxlen=limit)
+        self.redo_stack: List[Move] = []
+        self._replaying = False
+
+    def before_move(self, game) -> tuple:
+        """Called by Game before it applies a move."""
+        b = game.board
+        pre = None
+        if not b.generated:
+            # generating wipes flags placed before the first click; keep them for undo
+            flags = [(r, c) for r in range(b.size) for c in range(b.size) if b.flagged[r][c]] if b.flags_placed else []
+            pre = (game.random.getstate(), flags)
+        return (b.revealed_safe, b.flags_placed, game.game_over, game.win, pre)
+
+    def record(self, before: tuple, kind: str, r: int, c: int, runs=(), exploded=()):
+        """Called by Game after a move was applied."""
+        *counters, pre = before
+        self.undo_stack.append(Move(kind, r, c, runs, exploded, tuple(counters), pre if kind == 'L' else None))
+        if not self._replaying:
+            self.redo_stack.clear()
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    def undo(self, game) -> Optional[List[Cell]]:
+        """Revert the last move; returns the cells whose display changed, or None if nothing to undo."""
+        if not self.undo_stack:
+            return None
+        move = self.undo_stack.pop()
+        b = game.board
+        changed = [(move.r, move.c)]
+        if move.kind == 'R':
+            if b.flags_placed != move.before[1]:   # toggle_flag is a no-op on revealed cells
+                b.flagged[move.r][move.c] = not b.flagged[move.r][move.c]
+        else:
+            for (row, lo, hi) in move.runs:
+                for col in range(lo, hi+1):
+                    b.revealed[row][col] = False
+                    changed.append((row, col))
+            for (row, col) in move.exploded:
+                b.revealed[row][col] = False
+                changed.append((row, col))
+            if move.rng_state is not None:
+                # this move dealt the board; redo regenerates it from the same rng state
+                state, flags = move.rng_state
+                game.random.setstate(state)
+                b.generated = False
+                for (row, col) in flags:
+                    b.flagged[row][col] = True
+                    changed.append((row, col))
+        b.revealed_safe, b.flags_placed, game.game_over, game.win = move.before
+        self.redo_stack.append(move)
+        if game.journal is not None:
+            # the journal only knows forward moves; compact so it reflects the undo
+            game.journal.snapshot(game)
+        return changed
+
+    def redo(self, game) -> Optional[dict]:
+        """Re-apply the last undone move; returns that move's result dict, or None."""
+        if not self.redo_stack:
+            return None
+        move = self.redo_stack.pop()
+        self._replaying = True
+        try:
+            if move.kind == 'R':
+                return game.right_click(move.r, move.c)
+            return game.left_click(move.r, move.c, runs=True)
+        finally:
+            self._replaying = False
@@ -0,0 +1,213 @@
+# instrument.py
+"""
+Opt-in instrumentation: call counters and latency histograms for the hot paths.
+
+Nothing is wrapped until enable() is called, so there is no overhead at all when
+instrumentation is off. enable() replaces the target functions with timing
+wrappers; disable() puts the originals back.
+
+Default targets: Board.generate / reveal of every importable engine,
+Game.left_click / right_click, file_manager.save_game / load_game (autosaves
+included) and AutoSaver.save, the snapshot taken on the UI thread. The GUI adds
+its redraw methods through `extra`. Reveal cascades are also recorded as a
+histogram of cells revealed per call.
+
+    instrument.enable()
+    instrument.profile_moves(500, "moves.prof")   # optional cProfile capture
+    ...
+    print(instrument.report())                    # or snapshot() to poll, dump(path) to save
+
+Set MINESWEEPER_INSTRUMENT=1 to turn it on in main.py (report written on exit).
+"""
+import cProfile
+import functools
+import importlib
+import io
+import json
+import pstats
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# (module, class or None, attribute)
+TARGETS: List[Tuple[str, Optional[str], str]] = [
+    ('board', 'Board', 'generate'),
+    ('board', 'Board', 'reveal'),
+    ('numpy_board', 'NumpyBoard', 'generate'),
+    ('packed_board', 'PackedBoard', 'generate'),
+    ('packed_board', 'PackedBoard', 'reveal'),
+    ('chunked_board', 'ChunkedBoard', 'reveal'),
+    ('game_logic', 'Game', 'left_click'),
+    ('game_logic', 'Game', 'right_click'),
+    ('file_manager', None, 'save_game'),
+    ('file_manager', None, 'load_game'),
+    ('autosave', 'AutoSaver', 'save'),   # the snapshot taken on the caller's (Tk) thread
+]
+
+class Histogram:
+    """Power-of-two buckets: bucket k holds values in [2**(k-1), 2**k)."""
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value: int):
+        self.buckets[min(int(value).bit_length(), 63)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-th percentile."""
+        if not self.count:
+            return 0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(1 << k, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'count': self.count, 'total': self.total, 'max': self.max,
+                'mean': self.total / self.count if self.count else 0,
+                'p50': self.percentile(50), 'p99': self.percentile(99)}
+
+counters: Dict[str, int] = {}
+latency_ns: Dict[str, Histogram] = {}
+sizes: Dict[str, Histogram] = {}
+
+_patched: List[Tuple[Any, str, Any]] = []
+_profile = {'profiler': None, 'moves_left': 0, 'path': None, 'text': None}
+
+def _hist(table: Dict[str, Histogram], name: str) -> Histogram:
+    h = table.get(name)
+    if h is None:
+        h = table[name] = Histogram()
+    return h
+
+def _cells(result) -> int:
+    """Cells in a reveal result (plain cells or (row, col_start, col_end) runs)."""
+    if result and len(result[0]) == 3:
+        return sum(hi - lo + 1 for (_, lo, hi) in result)
+    return len(result)
+
+def _wrap(name: str, fn):
+    clock = time.perf_counter_ns
+    is_reveal = name.endswith('.reveal')
+    is_move = name.endswith('_click')
+
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        t0 = clock()
+        try:
+            return_value = fn(*args, **kwargs)
+        finally:
+            _hist(latency_ns, name).add(clock() - t0)
+            counters[name] = counters.get(name, 0) + 1
+        if is_reveal:
+            _hist(sizes, name + '.cells').add(_cells(return_value))
+        if is_move and _profile['profiler'] is not None:
+            _count_profiled_move()
+        return return_value
+    timed.__wrapped_original__ = fn
+    return timed
+
+def _patch(owner, attr: str, name: str):
+    original = owner.__dict__.get(attr) if isinstance(owner, type) else getattr(owner, attr, None)
+    if original is None or hasattr(original, '__wrapped_original__'):
+        return
+    setattr(owner, attr, _wrap(name, original))
+    _patched.append((owner, attr, original))
+
+def enable(extra: List[Tuple[Any, str]] = ()):
+    """Wrap the default targets (engines whose dependencies are missing are skipped) plus (owner, attr) pairs."""
+    for module_name, cls_name, attr in TARGETS:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        owner = getattr(module, cls_name) if cls_name else module
+        _patch(owner, attr, f"{cls_name or module_name}.{attr}")
+    for owner, attr in extra:
+        _patch(owner, attr, f"{getattr(owner, '__name__', type(owner).__name__)}.{attr}")
+
+def disable():
+    """Restore every wrapped function (collected data is kept)."""
+    while _patched:
+        owner, attr, original = _patched.pop()
+        setattr(owner, attr, original)
+    if _profile['profiler'] is not None:
+        _finish_profile()
+
+def enabled() -> bool:
+    return bool(_patched)
+
+def count(name: str, n: int = 1):
+    """Bump a custom counter (only meaningful while enabled, but always cheap)."""
+    counters[name] = counters.get(name, 0) + n
+
+def reset():
+    counters.clear()
+    latency_ns.clear()
+    sizes.clear()
+
+# -----------------------
+# Profiling
+# -----------------------
+def profile_moves(moves: int, path: str = None):
+    """Run cProfile over the next `moves` left/right clicks (needs enable()); stats go to path or last_profile()."""
+    if _profile['profiler'] is not None:
+        _finish_profile()
+    _profile.update(profiler=cProfile.Profile(), moves_left=int(moves), path=path, text=None)
+    _profile['profiler'].enable()
+
+def _count_profiled_move():
+    _profile['moves_left'] -= 1
+    if _profile['moves_left'] <= 0:
+        _finish_profile()
+
+def _finish_profile():
+    prof = _profile['profiler']
+    prof.disable()
+    _profile['profiler'] = None
+    if _profile['path']:
+        prof.dump_stats(_profile['path'])
+    out = io.StringIO()
+    pstats.Stats(prof, stream=out).sort_stats('cumulative').print_stats(30)
+    _profile['text'] = out.getvalue()
+
+def last_profile() -> Optional[str]:
+    """Text report of the last finished profile_moves() capture."""
+    return _profile['text']
+
+# -----------------------
+# Output
+# -----------------------
+def snapshot() -> Dict[str, Any]:
+    """Current counters and histograms as plain data (latencies in nanoseconds)."""
+    return {
+        'counters': dict(counters),
+        'latency_ns': {name: h.to_dict() for name, h in latency_ns.items()},
+        'sizes': {name: h.to_dict() for name, h in sizes.items()},
+    }
+
+def dump(path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot(), f, indent=2)
+
+def report() -> str:
+    """Human readable table, slowest total time first."""
+    lines = [f"{'name':32} {'calls':>9} {'mean us':>10} {'p50 us':>9} {'p99 us':>9} {'max us':>10}"]
+    for name, h in sorted(latency_ns.items(), key=lambda kv: -kv[1].total):
+        d = h.to_dict()
+        lines.append(f"{name:32} {d['count']:>9} {d['mean']/1e3:>10.1f} {d['p50']/1e3:>9.1f} "
+                     f"{d['p99']/1e3:>9.1f} {d['max']/1e3:>10.1f}")
+    for name, h in sorted(sizes.items()):
+        d = h.to_dict()
+        lines.append(f"{name:32} {d['count']:>9} mean {d['mean']:.1f} p99 {d['p99']} max {d['max']}")
+    return "\n".join(lines)
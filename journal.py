@@ -0,0 +1,127 @@
+# journal.py
+"""
+Append-only move journal with periodic compacted snapshots.
+
+Files for a journal at `base`, per generation g:
+  {base}.{g}.snap  full binary save (file_manager.save_game) taken when generation g started
+  {base}.{g}.log   one line per move made since that snapshot: "L r c" or "R r c"
+Each move costs one short append, independent of board size. Every snapshot_every
+moves a new generation is started: the new log is opened first, then the snapshot is
+written via temp file + rename, then the old generation is deleted. A crash at any
+point leaves at least one complete snapshot whose own log holds every later move,
+which is what recover() replays.
+"""
+import glob
+import os
+
+import file_manager
+
+class Journal:
+    def __init__(self, base: str, snapshot_every: int = 1000, fsync: bool = False):
+        self.base = base
+        self.snapshot_every = int(snapshot_every)
+        self.fsync = fsync
+        self.generation: int = -1
+        self.moves_since_snapshot: int = 0
+        self._log = None
+
+    def _path(self, generation: int, ext: str) -> str:
+        return f"{self.base}.{generation}.{ext}"
+
+    def attach(self, game):
+        """Start journaling game: write a snapshot of its current state and record every move from now on."""
+        game.journal = self
+        self.snapshot(game)
+
+    def record(self, game, kind: str, r: int, c: int):
+        """Called by Game after a left ('L') or right ('R') click was applied."""
+        self._log.write(f"{kind} {r} {c}\n")
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self.moves_since_snapshot += 1
+        if self.moves_since_snapshot >= self.snapshot_every:
+            self.snapshot(game)
+
+    def snapshot(self, game):
+        """Compact: start a new generation holding the full current state and an empty log."""
+        old = self.generation
+        new = max(old, _latest_generation(self.base, 'snap'), _latest_generation(self.base, 'log')) + 1
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self._path(new, 'log'), 'w', encoding='ascii')
+        # atomic: written as .snap.tmp, then renamed
+        file_manager.save_game(game.get_state(planes=True), self._path(new, 'snap'), fsync=self.fsync)
+        self.generation = new
+        self.moves_since_snapshot = 0
+        for g in _generations(self.base):
+            if g < new:
+                for ext in ('snap', 'log', 'snap.tmp'):
+                    try:
+                        os.remove(self._path(g, ext))
+                    except FileNotFoundError:
+                        pass
+
+    def _resume(self, generation: int, moves: int):
+        self.generation = generation
+        self.moves_since_snapshot = moves
+        self._log = open(self._path(generation, 'log'), 'a', encoding='ascii')
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+def _generations(base: str):
+    found = set()
+    for path in glob.glob(glob.escape(base) + '.*.*'):
+        gen = path[len(base) + 1:].split('.', 1)[0]
+        if gen.isdigit():
+            found.add(int(gen))
+    return sorted(found)
+
+def _latest_generation(base: str, ext: str) -> int:
+    gens = [g for g in _generations(base) if os.path.exists(f"{base}.{g}.{ext}")]
+    return gens[-1] if gens else -1
+
+def _rebuild(base: str, engine=None):
+    """Newest snapshot + complete log records -> (game, generation, moves replayed, torn tail?)."""
+    from game_logic import Game
+    generation = _latest_generation(base, 'snap')
+    if generation < 0:
+        raise FileNotFoundError(f"no journal snapshot found for {base}")
+    game = Game(engine=engine)
+    game.load_state(file_manager.load_game(f"{base}.{generation}.snap"))
+    moves = 0
+    torn = ''
+    log_path = f"{base}.{generation}.log"
+    if os.path.exists(log_path):
+        with open(log_path, 'r', encoding='ascii') as f:
+            complete, _, torn = f.read().rpartition('\n')
+        lines = complete.splitlines()
+        game.apply_moves(((kind, int(r), int(c)) for kind, r, c in map(str.split, lines)), outcomes=False)
+        moves = len(lines)
+    return game, generation, moves, bool(torn)
+
+def replay(base: str, engine=None):
+    """Read-only recovery: returns (game, moves replayed) without touching the files or attaching a journal."""
+    game, _, moves, _ = _rebuild(base, engine)
+    return game, moves
+
+def recover(base: str, engine=None, snapshot_every: int = 1000, fsync: bool = False):
+    """
+    Rebuild a Game from the newest complete snapshot plus its journal tail, and keep
+    journaling it. A torn final line (crash mid-append) is ignored.
+    """
+    game, generation, moves, torn = _rebuild(base, engine)
+    if torn:
+        # drop the partial record so later appends start on a clean line
+        log_path = f"{base}.{generation}.log"
+        with open(log_path, 'r', encoding='ascii') as f:
+            complete = f.read().rpartition('\n')[0]
+        with open(log_path, 'w', encoding='ascii') as f:
+            f.write(complete + '\n' if complete else '')
+    journal = Journal(base, snapshot_every=snapshot_every, fsync=fsync)
+    journal._resume(generation, moves)
+    game.journal = journal
+    return game
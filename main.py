@@ -4,16 +4,29 @@ Minesweeper GUI Deluxe — polished version
 Features:
 - Main menu with animated preview & difficulty cards
 - Practice (seed) working properly
+- Daily challenge boards (same board for everybody, per day)
 - Safer timer (no label crash)
 - Smooth explosion + mine glow animation
 - Hint, Save/Load, Back to Menu
+- Background autosave (rotating slots, atomic writes)
+- Undo / Redo (Ctrl+Z / Ctrl+Y)
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from game_logic import Game
-from file_manager import save_game, load_game, SAVE_FILENAME
-import random
+from game_logic import Game, DIFFICULTIES
+import file_manager
+from file_manager import SAVE_FILENAME
+from autosave import AutoSaver
+from solver import Solver
+from history import History
+from board_library import BoardLibrary, daily_seed
+from stats import StatsStore, difficulty_name
+from board import runs_to_cells
+from probability import mine_probabilities
+from animation import Animator, frame_index
+import instrument
+import os
 import time
 
 # ----- Styling constants -----
@@ -27,6 +40,7 @@ TEXT_COLOR = "#222"
 TITLE_FONT = ("Inter", 20, "bold")
 SMALL_FONT = ("Inter", 10)
 DIGIT_FONTS = ("Helvetica", 14, "bold")
+AUTOSAVE_DELAY_MS = 500   # quiet time after the last move before its autosave snapshot
 EMOJI_FLAG = "🚩"
 EMOJI_MINE = "💣"
 
@@ -36,6 +50,12 @@ NUMBER_COLORS = {
 }
 
 
+def heat_color(p: float) -> str:
+    """Tile color for mine probability p: grey-green (safe) to red (certain mine)."""
+    p = max(0.0, min(1.0, p))
+    return "#%02x%02x%02x" % (int(120 + 135 * p), int(200 - 150 * p), int(140 - 90 * p))
+
+
 def choose_cell_size(board_px: int, size: int, max_cell: int = 48, min_cell: int = 18):
     return max(min_cell, min(max_cell, board_px // size))
 
@@ -47,8 +67,23 @@ class MinesweeperApp:
         self.root.geometry("820x620")
         self.root.configure(bg=BG)
         self.current_game: Game = None
+        self.solver: Solver = None
         self.elapsed_sec = 0
         self.timer_job = None
+        self.animator = Animator(root)
+        self.heatmap = None      # probability.Probabilities while the odds overlay is on
+        self.no_guess_var = tk.BooleanVar(value=False)
+        # seeded (practice / daily) layouts are generated once and then shared
+        Game.library = BoardLibrary()
+        self.stats = StatsStore()
+        # snapshots are taken on the Tk thread, written by a worker
+        # moves are already debounced by AUTOSAVE_DELAY_MS before the snapshot, so no second delay here
+        self.autosaver = AutoSaver(slots=3, delay=0)
+        self._autosave_job = None
+        self.current_seed = None
+        # each game goes into the stats once, and only if undo was never used
+        self.game_recorded = False
+        self.used_undo = False
 
         self._build_main_menu()
 
@@ -56,6 +91,7 @@ class MinesweeperApp:
     # Main Menu
     # -----------------------
     def _build_main_menu(self):
+        self.animator.cancel()
         for w in self.root.winfo_children():
             w.destroy()
 
@@ -74,11 +110,7 @@ class MinesweeperApp:
         menu_frame = tk.Frame(self.root, bg=BG)
         menu_frame.pack(pady=14)
 
-        difficulties = [
-            ("Easy", 9, 9, 10),
-            ("Medium", 16, 16, 40),
-            ("Hard", 22, 22, 99)
-        ]
+        difficulties = [(name, size, size, mines) for name, (size, mines) in DIFFICULTIES.items()]
 
         for name, side_r, side_c, mines in difficulties:
             card = tk.Frame(menu_frame, bg=PANEL, padx=18, pady=12)
@@ -95,12 +127,21 @@ class MinesweeperApp:
                       command=lambda s=side_r, m=mines: self.start_new_game(s, m)).pack(side="left", padx=6)
             tk.Button(btn_frame, text="Practice (seed)", width=12,
                       command=lambda s=side_r, m=mines: self._seed_and_start(s, m)).pack(side="left")
+            tk.Button(btn_frame, text="Daily", width=6,
+                      command=lambda s=side_r, m=mines: self.start_new_game(s, m, seed=daily_seed())).pack(side="left", padx=(6, 0))
 
         ctl = tk.Frame(self.root, bg=BG)
         ctl.pack(pady=14)
         tk.Button(ctl, text="Load Saved Game", width=18, command=self.load_game_ui).pack(side="left", padx=8)
+        tk.Button(ctl, text="Resume autosave", width=14,
+                  command=lambda: self.load_game_ui(autosave=True)).pack(side="left", padx=8)
+        tk.Button(ctl, text="Custom board", width=12, command=self._custom_and_start).pack(side="left", padx=8)
+        tk.Button(ctl, text="Leaderboard", width=12, command=self.show_leaderboard).pack(side="left", padx=8)
         tk.Button(ctl, text="How to play", width=12, command=self.show_help).pack(side="left", padx=8)
         tk.Button(ctl, text="Exit", width=10, command=self.root.quit).pack(side="left", padx=8)
+        tk.Checkbutton(self.root, text="No-guess boards (always solvable by logic)", variable=self.no_guess_var,
+                       command=self._toggle_no_guess, bg=BG, fg="#cbd5e1", selectcolor=PANEL,
+                       activebackground=BG, activeforeground="white", font=SMALL_FONT).pack()
 
     def _draw_preview_animation(self, canvas: tk.Canvas):
         canvas.delete("all")
@@ -112,18 +153,21 @@ class MinesweeperApp:
                 x1, y1 = x0 + cellw - 6, y0 + cellh - 6
                 canvas.create_rectangle(x0, y0, x1, y1, fill="#cfd8dc", outline="#b0bec5", width=1)
         sparks = [(1, 1), (1, 3), (2, 5), (3, 2), (3, 4)]
+        spark = canvas.create_oval(0, 0, 0, 0, fill="#ff2c2c", outline="")
+        shown = [None]
 
-        def step(i=0):
-            canvas.delete("spark")
-            r, c = sparks[i % len(sparks)]
+        def step(t):
+            # one oval, moved to the next spark every 420ms
+            i = frame_index(t, len(sparks))
+            if i == shown[0]:
+                return
+            shown[0] = i
+            r, c = sparks[i]
             x0 = pad + c * cellw + 6
             y0 = pad + r * cellh + 6
-            x1 = x0 + cellw - 18
-            y1 = y0 + cellh - 18
-            canvas.create_oval(x0, y0, x1, y1, fill="#ff2c2c", outline="", tags="spark")
-            canvas.after(420, lambda: step(i + 1))
+            canvas.coords(spark, x0, y0, x0 + cellw - 18, y0 + cellh - 18)
 
-        step(0)
+        self.animator.add("preview", 420 * len(sparks), step, loop=True, frames=len(sparks))
 
     # -----------------------
     # Game logic + UI
@@ -136,13 +180,32 @@ class MinesweeperApp:
             seed = None
         self.start_new_game(size, mines, seed=seed)
 
+    def _custom_and_start(self):
+        size = simpledialog.askinteger("Custom board", "Board size (cells per side):",
+                                       parent=self.root, minvalue=5, maxvalue=1000)
+        if not size:
+            return
+        mines = simpledialog.askinteger("Custom board", "Number of mines:", parent=self.root,
+                                        minvalue=1, maxvalue=size * size - 9, initialvalue=size * size // 5)
+        if not mines:
+            return
+        self.start_new_game(size, mines)
+
     def start_new_game(self, size: int, mines: int, seed=None):
-        self.current_game = Game(size=size, mines=mines, seed=seed)
+        self._autosave_now()
+        self.current_game = Game(size=size, mines=mines, seed=seed, no_guess=self.no_guess_var.get())
+        self.current_seed = seed
+        self.current_game.history = History()
+        self.game_recorded = False
+        self.used_undo = False
+        self.solver = Solver(self.current_game.board)
         self.elapsed_sec = 0
         self._build_game_ui(size, mines)
         self._start_timer()
 
     def _build_game_ui(self, size, mines):
+        self.animator.cancel()
+        self.heatmap = None
         for w in self.root.winfo_children():
             w.destroy()
 
@@ -168,70 +231,235 @@ class MinesweeperApp:
 
         cell_px = choose_cell_size(560, size, max_cell=44, min_cell=18)
         self.cell_px = cell_px
-        canvas_w, canvas_h = cell_px * size, cell_px * size
-        self.board_canvas = tk.Canvas(board_frame, width=min(canvas_w, 700), height=min(canvas_h, 500),
+        canvas_w, canvas_h = cell_px * size + 6, cell_px * size + 6
+        view_w, view_h = min(canvas_w, 700), min(canvas_h, 500)
+        self.board_canvas = tk.Canvas(board_frame, width=view_w, height=view_h,
                                       bg="#101217", highlightthickness=0)
-        self.board_canvas.pack(side="left", padx=12, pady=6)
+        self.board_canvas.grid(row=0, column=0, padx=(12, 0), pady=6)
         self.board_canvas.config(scrollregion=(0, 0, canvas_w, canvas_h))
-
-        self.canvas_cells = [[None] * size for _ in range(size)]
-        self.canvas_texts = [[None] * size for _ in range(size)]
-
-        for r in range(size):
-            for c in range(size):
-                x0, y0 = c * cell_px, r * cell_px
-                x1, y1 = x0 + cell_px - 2, y0 + cell_px - 2
-                rect = self.board_canvas.create_rectangle(x0 + 4, y0 + 4, x1 + 4, y1 + 4,
-                                                          fill=TILE_BG, outline="#9aa6b2", width=2)
-                txt = self.board_canvas.create_text(x0 + cell_px / 2 + 4, y0 + cell_px / 2 + 4,
-                                                    text="", font=DIGIT_FONTS, fill=TEXT_COLOR)
-                self.canvas_cells[r][c] = rect
-                self.canvas_texts[r][c] = txt
-                self.board_canvas.tag_bind(rect, "<Button-1>", lambda e, rr=r, cc=c: self.on_left_click(rr, cc))
-                self.board_canvas.tag_bind(txt, "<Button-1>", lambda e, rr=r, cc=c: self.on_left_click(rr, cc))
-                self.board_canvas.tag_bind(rect, "<Button-3>", lambda e, rr=r, cc=c: self.on_right_click(rr, cc))
-                self.board_canvas.tag_bind(txt, "<Button-3>", lambda e, rr=r, cc=c: self.on_right_click(rr, cc))
+        if canvas_h > view_h:
+            vbar = tk.Scrollbar(board_frame, orient="vertical", command=self._scroll_y)
+            vbar.grid(row=0, column=1, sticky="ns", pady=6)
+            self.board_canvas.config(yscrollcommand=vbar.set)
+        if canvas_w > view_w:
+            hbar = tk.Scrollbar(board_frame, orient="horizontal", command=self._scroll_x)
+            hbar.grid(row=1, column=0, sticky="ew", padx=(12, 0))
+            self.board_canvas.config(xscrollcommand=hbar.set)
+
+        # one handler per button for the whole board; tiles only exist for the viewport
+        self.board_canvas.bind("<Button-1>", lambda e: self._on_canvas_click(e, self.on_left_click))
+        self.board_canvas.bind("<Button-3>", lambda e: self._on_canvas_click(e, self.on_right_click))
+        self.board_canvas.bind("<MouseWheel>", lambda e: self._scroll_y("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.board_canvas.bind("<Button-4>", lambda e: self._scroll_y("scroll", -1, "units"))
+        self.board_canvas.bind("<Button-5>", lambda e: self._scroll_y("scroll", 1, "units"))
+        self.board_canvas.bind("<Configure>", lambda e: self._sync_viewport())
+        self.board_canvas.config(yscrollincrement=cell_px, xscrollincrement=cell_px)
+        self.tile_items = {}     # (r, c) -> (rect, txt) for cells in the viewport
+        self.free_items = []     # hidden (rect, txt) pairs ready for reuse
+        self.viewport = None
 
         bot = tk.Frame(self.root, bg=BG)
         bot.pack(fill="x", pady=8)
         tk.Button(bot, text="Back to Menu", command=self._back_to_menu).pack(side="left", padx=12)
         tk.Button(bot, text="Hint (safe reveal)", command=self._safe_hint).pack(side="left", padx=10)
+        tk.Button(bot, text="Undo", command=self._undo).pack(side="left", padx=4)
+        tk.Button(bot, text="Redo", command=self._redo).pack(side="left", padx=4)
+        tk.Button(bot, text="Odds", command=self._toggle_heatmap).pack(side="left", padx=10)
+        self.root.bind("<Control-z>", lambda e: self._undo())
+        self.root.bind("<Control-y>", lambda e: self._redo())
 
         self._redraw_board()
 
+    # -----------------------
+    # Viewport
+    # -----------------------
+    def _visible_range(self):
+        cv, p = self.board_canvas, self.cell_px
+        n = self.current_game.board.size
+        x0, y0 = cv.canvasx(0) - 4, cv.canvasy(0) - 4
+        w = max(cv.winfo_width(), int(cv["width"]))
+        h = max(cv.winfo_height(), int(cv["height"]))
+        return (max(0, int(y0 // p)), min(n, int((y0 + h) // p) + 1),
+                max(0, int(x0 // p)), min(n, int((x0 + w) // p) + 1))
+
+    def _sync_viewport(self):
+        """Give canvas items to the cells that are visible, recycling those of cells scrolled away."""
+        view = self._visible_range()
+        if view == self.viewport:
+            return
+        self.viewport = view
+        r0, r1, c0, c1 = view
+        for cell in [cell for cell in self.tile_items
+                     if not (r0 <= cell[0] < r1 and c0 <= cell[1] < c1)]:
+            items = self.tile_items.pop(cell)
+            for item in items:
+                self.board_canvas.itemconfig(item, state="hidden")
+            self.free_items.append(items)
+        p = self.cell_px
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                if (r, c) in self.tile_items:
+                    continue
+                x0, y0 = c * p + 4, r * p + 4
+                if self.free_items:
+                    rect, txt = self.free_items.pop()
+                    self.board_canvas.coords(rect, x0, y0, x0 + p - 2, y0 + p - 2)
+                    self.board_canvas.coords(txt, x0 + p / 2, y0 + p / 2)
+                    self.board_canvas.itemconfig(rect, state="normal")
+                    self.board_canvas.itemconfig(txt, state="normal")
+                else:
+                    rect = self.board_canvas.create_rectangle(x0, y0, x0 + p - 2, y0 + p - 2,
+                                                              fill=TILE_BG, outline="#9aa6b2", width=2)
+                    txt = self.board_canvas.create_text(x0 + p / 2, y0 + p / 2,
+                                                        text="", font=DIGIT_FONTS, fill=TEXT_COLOR)
+                self.tile_items[(r, c)] = (rect, txt)
+                self._redraw_tile(r, c)
+
+    def _scroll_x(self, *args):
+        self.board_canvas.xview(*args)
+        self._sync_viewport()
+
+    def _scroll_y(self, *args):
+        self.board_canvas.yview(*args)
+        self._sync_viewport()
+
+    def _on_canvas_click(self, event, handler):
+        x = self.board_canvas.canvasx(event.x) - 4
+        y = self.board_canvas.canvasy(event.y) - 4
+        if x < 0 or y < 0:
+            return
+        r, c = int(y // self.cell_px), int(x // self.cell_px)
+        if self.current_game.board.in_bounds(r, c):
+            handler(r, c)
+
     # -----------------------
     # Clicks
     # -----------------------
     def on_left_click(self, r, c):
         if not self.current_game:
             return
-        res = self.current_game.left_click(r, c)
-        for (rr, cc) in res["revealed"]:
-            self._reveal_tile(rr, cc)
+        dealt = not self.current_game.board.generated
+        res = self.current_game.left_click(r, c, runs=True)
+        self._after_left_click(res)
+        if dealt and self.current_game.board.guess_free is False:
+            messagebox.showwarning("No-guess", "No guess-free board was found in time; "
+                                   "this one may need a guess.")
+
+    def _after_left_click(self, res):
+        if self.solver is not None:
+            self.solver.update(runs_to_cells(res["revealed"]))
+        self._show_revealed(res["revealed"])
+        self._refresh_heatmap()
+        self._autosave()
         if res["hit_mine"]:
             self.face_btn.config(text="💥")
             self._play_explosion_animation()
             self._stop_timer()
+            self._record_result(False)
             messagebox.showerror("Boom!", "You hit a mine! Game over.")
             self._reveal_all_mines_visual()
         elif res["win"]:
             self.face_btn.config(text="😎")
             self._stop_timer()
+            self._record_result(True)
             messagebox.showinfo("You win!", f"You cleared the board in {self.elapsed_sec} seconds!")
         self._update_info()
 
+    def _record_result(self, won: bool):
+        # redo replays a finishing move, and a result reached after an undo is not a fair one
+        if self.game_recorded or self.used_undo:
+            return
+        self.game_recorded = True
+        # queued; written by the store's background thread
+        b = self.current_game.board
+        self.stats.record(difficulty_name(b.size, b.mines), b.size, b.mines, won, self.elapsed_sec,
+                          seed=self.current_seed)
+
     def on_right_click(self, r, c):
         res = self.current_game.right_click(r, c)
         self._redraw_tile(r, c)
         self._update_info()
+        self._autosave()
+
+    def _autosave(self):
+        """Queue an autosave: a burst of moves costs one snapshot, and the final move is saved at once."""
+        if not self.current_game:
+            return
+        if self._autosave_job is None:
+            self._autosave_job = self.root.after(AUTOSAVE_DELAY_MS, self._autosave_now)
+        if self.current_game.game_over:
+            # so "Resume autosave" shows how the game ended, not the position before
+            self._autosave_now()
+
+    def _autosave_now(self):
+        """Take the pending autosave snapshot, if any, right now."""
+        if self._autosave_job is None:
+            return
+        self.root.after_cancel(self._autosave_job)
+        self._autosave_job = None
+        if self.current_game:
+            self.autosaver.save(self.current_game)
+
+    def _toggle_heatmap(self):
+        if self.heatmap is None:
+            self._refresh_heatmap(force=True)
+        else:
+            self.heatmap = None
+            self._redraw_board()
+
+    def _refresh_heatmap(self, force: bool = False):
+        """Recompute the odds overlay (only while it is shown) and repaint the viewport."""
+        if self.heatmap is None and not force:
+            return
+        self.heatmap = mine_probabilities(self.current_game.board, budget_ms=30)
+        self._redraw_board()
+
+    def _undo(self):
+        if not self.current_game:
+            return
+        changed = self.current_game.undo()
+        if changed is None:
+            return
+        self.used_undo = True
+        # the solver only moves forward; rebuild it lazily on the next hint
+        self.solver = None
+        for (r, c) in changed:
+            self._redraw_tile(r, c)
+        self._refresh_heatmap()
+        self._autosave()
+        if not self.current_game.game_over:
+            self.face_btn.config(text="🙂")
+            self._resume_timer()
+        self._update_info()
+
+    def _redo(self):
+        if not self.current_game:
+            return
+        res = self.current_game.redo()
+        if res is None:
+            return
+        if "revealed" in res:
+            self._after_left_click(res)
+        else:
+            self._redraw_board()
 
     # -----------------------
     # Visuals
     # -----------------------
+    def _show_revealed(self, runs):
+        """Paint revealed row runs, clipped to the viewport."""
+        r0, r1, c0, c1 = self.viewport
+        for (r, lo, hi) in runs:
+            if r0 <= r < r1:
+                for c in range(max(lo, c0), min(hi + 1, c1)):
+                    self._reveal_tile(r, c)
+
     def _reveal_tile(self, r, c):
+        items = self.tile_items.get((r, c))
+        if items is None:
+            return   # off screen; drawn when scrolled into view
         board = self.current_game.board
-        rect = self.canvas_cells[r][c]
-        txt = self.canvas_texts[r][c]
+        rect, txt = items
         self.board_canvas.itemconfig(rect, fill=TILE_REVEALED, outline="#bfc6cc")
         val = board.grid[r][c]
         if val == -1:
@@ -242,26 +470,33 @@ class MinesweeperApp:
             self.board_canvas.itemconfig(txt, text=str(val), fill=NUMBER_COLORS.get(val, "#333"))
 
     def _redraw_tile(self, r, c):
+        items = self.tile_items.get((r, c))
+        if items is None:
+            return
         b = self.current_game.board
-        rect, txt = self.canvas_cells[r][c], self.canvas_texts[r][c]
+        rect, txt = items
         if b.revealed[r][c]:
             self._reveal_tile(r, c)
         else:
-            self.board_canvas.itemconfig(rect, fill=TILE_BG)
+            fill = TILE_BG if self.heatmap is None else heat_color(self.heatmap[r, c])
+            self.board_canvas.itemconfig(rect, fill=fill, outline="#9aa6b2")
             if b.flagged[r][c]:
                 self.board_canvas.itemconfig(txt, text=EMOJI_FLAG, fill=FLAG_COLOR)
             else:
                 self.board_canvas.itemconfig(txt, text="")
 
     def _redraw_board(self):
-        for r in range(self.current_game.board.size):
-            for c in range(self.current_game.board.size):
-                self._redraw_tile(r, c)
+        """Repaint the viewport (cost is proportional to the visible area, not the board)."""
+        self._sync_viewport()
+        for (r, c) in self.tile_items:
+            self._redraw_tile(r, c)
         self._update_info()
 
     def _reveal_all_mines_visual(self):
-        for (r, c) in self.current_game.board.mine_positions:
-            self._reveal_tile(r, c)
+        b = self.current_game.board
+        for (r, c) in self.tile_items:
+            if b.is_mine(r, c):
+                self._reveal_tile(r, c)
 
     def _update_info(self):
         if self.current_game:
@@ -272,27 +507,31 @@ class MinesweeperApp:
 
     def _play_explosion_animation(self):
         b = self.current_game.board
-        centers = []
-        for (r, c) in b.mine_positions:
+        canvas = self.board_canvas
+        canvas.delete("anim")
+        # one ring per visible mine, created once and then only moved / recolored
+        rings = []
+        for (r, c) in self.tile_items:
+            if not b.is_mine(r, c):
+                continue
             x = c * self.cell_px + self.cell_px / 2 + 4
             y = r * self.cell_px + self.cell_px / 2 + 4
-            centers.append((x, y))
+            rings.append((canvas.create_oval(x, y, x, y, fill="", outline=MINE_COLOR, width=3, tags="anim"), x, y))
         steps = 15
+        shown = [None]
 
-        def tick(step=0):
-            self.board_canvas.delete("anim")
-            t = step / steps
-            for (x, y) in centers:
-                radius = 4 + 40 * t
-                color = MINE_COLOR if step % 2 == 0 else "#ff9999"
-                self.board_canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
-                                              fill="", outline=color, width=3, tags="anim")
-            if step < steps:
-                self.board_canvas.after(40, lambda: tick(step + 1))
-            else:
-                self.board_canvas.delete("anim")
+        def step(t):
+            frame = frame_index(t, steps + 1)
+            if frame == shown[0]:
+                return
+            shown[0] = frame
+            radius = 4 + 40 * frame / steps
+            for (item, x, y) in rings:
+                canvas.coords(item, x - radius, y - radius, x + radius, y + radius)
+            canvas.itemconfig("anim", outline=MINE_COLOR if frame % 2 == 0 else "#ff9999")
 
-        tick(0)
+        self.animator.add("explosion", 40 * (steps + 1), step, done=lambda: canvas.delete("anim"),
+                          frames=steps + 1)
 
     # -----------------------
     # Misc controls
@@ -300,8 +539,15 @@ class MinesweeperApp:
     def _start_timer(self):
         if self.timer_job:
             self.root.after_cancel(self.timer_job)
+        self.timer_job = None
         self.elapsed_sec = 0
         self.timer_label.config(text="Time: 0s")
+        self._resume_timer()
+
+    def _resume_timer(self):
+        """Keep counting from elapsed_sec (after an undo brought a finished game back)."""
+        if self.timer_job:
+            return
 
         def tick():
             if not self.timer_label.winfo_exists():
@@ -318,21 +564,30 @@ class MinesweeperApp:
             self.timer_job = None
 
     def _safe_hint(self):
-        b = self.current_game.board
-        candidates = [(r, c) for r in range(b.size) for c in range(b.size)
-                      if not b.revealed[r][c] and not b.flagged[r][c] and b.grid[r][c] != -1]
-        if not candidates:
-            messagebox.showinfo("Hint", "No safe hints available.")
+        if self.current_game.game_over:
+            return
+        # only cells that can be deduced from the visible numbers
+        if self.solver is None:
+            self.solver = Solver(self.current_game.board)
+        pick = self.solver.hint()
+        if pick is None:
+            messagebox.showinfo("Hint", "No cell can be proven safe right now — time to guess!")
             return
-        zeros = [p for p in candidates if b.grid[p[0]][p[1]] == 0]
-        pick = random.choice(zeros if zeros else candidates)
-        res = self.current_game.left_click(*pick)
-        for (rr, cc) in res["revealed"]:
-            self._reveal_tile(rr, cc)
+        res = self.current_game.left_click(*pick, runs=True)
+        self.solver.update(runs_to_cells(res["revealed"]))
+        self._show_revealed(res["revealed"])
+        self._refresh_heatmap()
+        self._autosave()
         if res["win"]:
             messagebox.showinfo("You win!", "Nice! You cleared the board.")
         self._update_info()
 
+    def _toggle_no_guess(self):
+        # pre-generate no-guess layouts in the background so first clicks stay instant
+        if self.no_guess_var.get():
+            import no_guess
+            no_guess.start_default_pool(DIFFICULTIES.values(), workers=2)
+
     def _restart_current(self):
         if self.current_game:
             s = self.current_game.board.size
@@ -347,24 +602,52 @@ class MinesweeperApp:
         if not self.current_game:
             messagebox.showwarning("Save", "No game running.")
             return
-        save_game(self.current_game.get_state())
+        if self.autosaver.last_error is not None:
+            messagebox.showwarning("Save", f"An earlier save failed: {self.autosaver.last_error}")
+            self.autosaver.last_error = None
+        # written in the background; the previous file stays intact until the new one is complete
+        self.autosaver.save(self.current_game, SAVE_FILENAME)
         messagebox.showinfo("Save", f"Game saved to {SAVE_FILENAME}")
 
-    def load_game_ui(self):
-        try:
-            state = load_game()
-        except FileNotFoundError:
-            messagebox.showwarning("Load", "No saved game file found.")
-            return
+    def load_game_ui(self, autosave: bool = False):
+        self._autosave_now()
+        if autosave:
+            self.autosaver.flush(timeout=2.0)
+            state = self.autosaver.load_latest()
+            if state is None:
+                messagebox.showwarning("Load", "No autosave found.")
+                return
+        else:
+            try:
+                state = file_manager.load_game()
+            except FileNotFoundError:
+                messagebox.showwarning("Load", "No saved game file found.")
+                return
         g = Game()
         g.load_state(state)
+        g.history = History()
         self.current_game = g
+        self.current_seed = None
+        self.game_recorded = g.game_over
+        self.used_undo = False
+        self.solver = Solver(g.board)
         self.elapsed_sec = 0
         self._build_game_ui(g.board.size, g.board.mines)
         self._redraw_board()
         self._start_timer()
         messagebox.showinfo("Load", "Saved game loaded successfully.")
 
+    def show_leaderboard(self):
+        self.stats.flush(timeout=2.0)
+        lines = []
+        for name in DIFFICULTIES:
+            s = self.stats.summary(name)
+            best = self.stats.top(name, 5)
+            lines.append(f"{name}: {s['wins']}/{s['games']} won"
+                         + (f", median {s['median']:.0f}s" if s['median'] is not None else ""))
+            lines.extend(f"   {i}. {row['seconds']:.0f}s" for i, row in enumerate(best, 1))
+        messagebox.showinfo("Leaderboard", "\n".join(lines))
+
     def show_help(self):
         msg = ("Left click → reveal a tile\n"
                "Right click → flag/unflag\n"
@@ -374,7 +657,23 @@ class MinesweeperApp:
 
 
 # ----- Run -----
-if __name__ == "__main__":
+def run():
+    if os.environ.get("MINESWEEPER_INSTRUMENT"):
+        instrument.enable(extra=[(MinesweeperApp, name) for name in
+                                 ("_sync_viewport", "_redraw_board", "_show_revealed", "_play_explosion_animation")])
     root = tk.Tk()
     app = MinesweeperApp(root)
     root.mainloop()
+    app._autosave_now()
+    app.stats.close()
+    app.autosaver.close(timeout=5.0)
+    if instrument.enabled():
+        instrument.dump("minesweeper metrics.json")
+        print(instrument.report())
+    if app.no_guess_var.get():
+        import no_guess
+        no_guess.stop_default_pool()
+
+
+if __name__ == "__main__":
+    run()
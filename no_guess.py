@@ -0,0 +1,185 @@
+# no_guess.py
+"""
+No-guess board generation.
+
+A layout is accepted only if solver.Solver can clear the whole board from the first
+click by logic alone. Rejection sampling is slow, so NoGuessPool keeps worker
+processes generating layouts ahead of demand, per (size, mines, first-click class).
+
+First-click classes use the square board's 8 symmetries: a layout solvable from
+cell X is, after rotating/mirroring, solvable from every image of X, so a Hard board
+needs layouts for 66 start cells instead of 484.
+
+Game(no_guess=True) installs `provider` as the board's layout_provider: it serves
+from the default pool when one is running and has a layout ready, otherwise it
+generates synchronously from the game's rng. Seeded games use `seeded_provider`,
+which never uses the pool, so the same seed always gives the same board.
+
+Generation gives up after max_attempts layouts (dense boards may have almost no
+guess-free layouts). The providers then return None, so the board deals an
+ordinary random layout, and set board.guess_free = False for the UI to report.
+"""
+import random
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from board import Board
+from solver import Solver
+
+Cell = Tuple[int,int]
+
+def _transforms(n: int) -> List[Callable[[int,int], Cell]]:
+    m = n - 1
+    return [
+        lambda r, c: (r, c), lambda r, c: (c, r),
+        lambda r, c: (m-r, c), lambda r, c: (r, m-c),
+        lambda r, c: (m-r, m-c), lambda r, c: (c, m-r),
+        lambda r, c: (m-c, r), lambda r, c: (m-c, m-r),
+    ]
+
+def canonical_start(n: int, r: int, c: int) -> Cell:
+    """Representative of (r,c)'s class under the square's symmetries."""
+    return min(t(r, c) for t in _transforms(n))
+
+def canonical_starts(n: int) -> List[Cell]:
+    return sorted({canonical_start(n, r, c) for r in range(n) for c in range(n)})
+
+def map_layout(n: int, layout: List[Cell], start: Cell, target: Cell) -> List[Cell]:
+    """Move a layout generated for `start` onto `target` (same symmetry class)."""
+    for t in _transforms(n):
+        if t(*start) == target:
+            return [t(r, c) for (r, c) in layout]
+    raise ValueError(f"{target} is not in the symmetry class of {start}")
+
+def solvable(size: int, mines: int, layout: List[Cell], start_r: int, start_c: int) -> bool:
+    """True if the layout can be cleared from (start_r, start_c) without guessing."""
+    board = Board(size, mines)
+    board.place_mines(layout)
+    if board.is_mine(start_r, start_c):
+        return False
+    solver = Solver(board, scan=False)
+    solver.update(board.reveal(start_r, start_c))
+    while not board.all_safe_revealed():
+        cell = solver.hint(budget=1 << 30)
+        if cell is None:
+            return False
+        solver.update(board.reveal(*cell))
+    return True
+
+def generate_no_guess(size: int, mines: int, start_r: int, start_c: int, rng: random.Random,
+                      max_attempts: int = 5000) -> Optional[List[Cell]]:
+    """Rejection-sample a no-guess layout; None if max_attempts ran out."""
+    board = Board(size, mines, rng)
+    for _ in range(max_attempts):
+        board.generate(start_r, start_c)
+        layout = list(board.mine_positions)
+        if solvable(size, mines, layout, start_r, start_c):
+            return layout
+    return None
+
+def _pool_job(size: int, mines: int, start: Cell, seed: int, max_attempts: int):
+    return size, mines, start, generate_no_guess(size, mines, start[0], start[1], random.Random(seed), max_attempts)
+
+class NoGuessPool:
+    """
+    Background pre-generation of no-guess layouts.
+    depth layouts are kept ready per (size, mines, canonical start cell); each take()
+    queues a replacement.
+    """
+    def __init__(self, workers: int = None, depth: int = 2, max_attempts: int = 5000):
+        self.depth = int(depth)
+        self.max_attempts = int(max_attempts)
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._ready: Dict[Tuple[int,int,Cell], deque] = {}
+        self._pending: Dict[Tuple[int,int,Cell], int] = {}
+        self._lock = threading.RLock()
+        self._seeds = random.SystemRandom()
+        self._closed = False
+
+    def _submit(self, size: int, mines: int, start: Cell):
+        key = (size, mines, start)
+        try:
+            fut = self._executor.submit(_pool_job, size, mines, start, self._seeds.getrandbits(64), self.max_attempts)
+        except RuntimeError:
+            # shut down or a worker died (BrokenProcessPool); callers fall back to sync generation
+            self._closed = True
+            return
+        self._pending[key] = self._pending.get(key, 0) + 1
+        fut.add_done_callback(lambda f: self._done(key, f))
+
+    def _done(self, key, fut):
+        try:
+            layout = fut.result()[3]
+            failed = False
+        except Exception:
+            layout, failed = None, True   # cancelled at shutdown or worker died
+        with self._lock:
+            self._pending[key] -= 1
+            if layout is not None:
+                self._ready.setdefault(key, deque()).append(layout)
+            if not self._closed and not failed:
+                self._top_up(key)
+
+    def _top_up(self, key):
+        queued = len(self._ready.get(key, ())) + self._pending.get(key, 0)
+        for _ in range(self.depth - queued):
+            self._submit(*key)
+
+    def prefill(self, size: int, mines: int, starts: List[Cell] = None):
+        """Start generating layouts for a difficulty (every first-click class by default)."""
+        with self._lock:
+            for start in starts or canonical_starts(size):
+                self._top_up((size, mines, canonical_start(size, *start)))
+
+    def take(self, size: int, mines: int, r: int, c: int) -> Optional[List[Cell]]:
+        """A ready layout for a first click at (r,c), or None if none is ready yet."""
+        start = canonical_start(size, r, c)
+        key = (size, mines, start)
+        with self._lock:
+            ready = self._ready.get(key)
+            layout = ready.popleft() if ready else None
+            if not self._closed:
+                self._top_up(key)
+        if layout is None:
+            return None
+        return map_layout(size, layout, start, (r, c))
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+_default_pool: Optional[NoGuessPool] = None
+
+def start_default_pool(difficulties=None, workers: int = None, depth: int = 2) -> NoGuessPool:
+    """Start the shared pool used by Game(no_guess=True) and prefill the given (size, mines) pairs."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = NoGuessPool(workers=workers, depth=depth)
+    for size, mines in difficulties or ():
+        _default_pool.prefill(size, mines)
+    return _default_pool
+
+def stop_default_pool():
+    global _default_pool
+    if _default_pool is not None:
+        _default_pool.close()
+        _default_pool = None
+
+def provider(board, start_r: int, start_c: int) -> Optional[List[Cell]]:
+    """Board.layout_provider for no-guess mode (None, with board.guess_free = False, if generation gave up)."""
+    layout = None
+    if _default_pool is not None:
+        layout = _default_pool.take(board.size, board.mines, start_r, start_c)
+    if layout is None:
+        return seeded_provider(board, start_r, start_c)
+    board.guess_free = True
+    return layout
+
+def seeded_provider(board, start_r: int, start_c: int) -> Optional[List[Cell]]:
+    """Board.layout_provider for reproducible no-guess games: only the board's own rng is used."""
+    layout = generate_no_guess(board.size, board.mines, start_r, start_c, board.rng)
+    board.guess_free = layout is not None
+    return layout
@@ -0,0 +1,137 @@
+# numpy_board.py
+"""
+NumPy-backed Board engine for large boards.
+- grid: int8 array, MINE (-1) for mine, otherwise 0..8
+- revealed / flagged: bool arrays
+Same public API as board.Board, so Game and the UI can use either engine.
+Given the same rng state it places exactly the same mines as board.Board.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+from board import Board, MINE, sample_mines
+from planes import PACKED_MINE
+
+
+class NumpyBoard(Board):
+    __slots__ = ('_grid_rows', '_revealed_rows', '_flagged_rows')
+
+    def reset_arrays(self):
+        n = self.size
+        self.grid = np.zeros((n, n), dtype=np.int8)
+        self.revealed = np.zeros((n, n), dtype=bool)
+        self.flagged = np.zeros((n, n), dtype=bool)
+        self.mine_positions = []
+        self.generated = False
+        self.revealed_safe = 0
+        self.flags_placed = 0
+        self._bind_views()
+
+    def _bind_views(self):
+        # per-row byte views for Board.reveal's scanline fill; per-element numpy indexing is slow
+        self._grid_rows = [memoryview(row) for row in self.grid.view(np.uint8)]
+        self._revealed_rows = [memoryview(row) for row in self.revealed.view(np.uint8)]
+        self._flagged_rows = [memoryview(row) for row in self.flagged.view(np.uint8)]
+
+    def _rows(self):
+        return self._grid_rows, self._revealed_rows, self._flagged_rows
+
+    def set_arrays(self, grid, revealed, flagged, mine_positions, generated: bool):
+        self.grid = np.ascontiguousarray(grid, dtype=np.int8)
+        self.revealed = np.ascontiguousarray(revealed, dtype=bool)
+        self.flagged = np.ascontiguousarray(flagged, dtype=bool)
+        self.mine_positions = [tuple(p) for p in mine_positions]
+        self.generated = bool(generated)
+        self._bind_views()
+        self.recount()
+
+    def scan_counts(self) -> Tuple[int, int]:
+        revealed_safe = int(np.count_nonzero(self.revealed & (self.grid != MINE)))
+        return revealed_safe, int(np.count_nonzero(self.flagged))
+
+    def generate(self, start_r: int, start_c: int):
+        """Place mines avoiding the first-click neighborhood, then count neighbors in one vectorized pass."""
+        if self.layout_provider is not None:
+            positions = self.layout_provider(self, start_r, start_c)
+            if positions is not None:
+                self.place_mines(positions)
+                return
+        self._place_flat(self.pick_mines(start_r, start_c))
+
+    def pick_mines(self, start_r: int, start_c: int) -> np.ndarray:
+        """Flat indices of a random layout for a first click at (start_r, start_c); nothing is placed."""
+        return np.asarray(sample_mines(self.rng, self.size, self.mines, start_r, start_c), dtype=np.int64)
+
+    def place_mines(self, positions):
+        rows, cols = zip(*positions) if positions else ((), ())
+        self._place_flat(np.asarray(rows, dtype=np.int64) * self.size + np.asarray(cols, dtype=np.int64))
+
+    def _place_flat(self, picks: np.ndarray):
+        self.reset_arrays()
+        n = self.size
+        mine = np.zeros(n * n, dtype=bool)
+        mine[picks] = True
+        mine = mine.reshape(n, n)
+        self.grid[:] = self.neighbor_counts(mine)
+        self.grid[mine] = MINE
+        rows, cols = np.divmod(picks, n)
+        self.mine_positions = list(zip(rows.tolist(), cols.tolist()))
+        self.generated = True
+
+    @staticmethod
+    def neighbor_counts(mine: np.ndarray) -> np.ndarray:
+        """Number of mines in the 8-neighborhood of every cell."""
+        n_r, n_c = mine.shape
+        padded = np.zeros((n_r + 2, n_c + 2), dtype=np.int8)
+        padded[1:-1, 1:-1] = mine
+        counts = np.zeros((n_r, n_c), dtype=np.int8)
+        for dr in (0, 1, 2):
+            for dc in (0, 1, 2):
+                if dr == 1 and dc == 1:
+                    continue
+                counts += padded[dr:dr+n_r, dc:dc+n_c]
+        return counts
+
+    def toggle_flag(self, r: int, c: int):
+        if not self.in_bounds(r, c):
+            return
+        if self.revealed[r, c]:
+            return
+        self.flagged[r, c] = not self.flagged[r, c]
+        self.flags_placed += 1 if self.flagged[r, c] else -1
+
+    def is_mine(self, r: int, c: int) -> bool:
+        return self.in_bounds(r, c) and bool(self.grid[r, c] == MINE)
+
+    def reveal_all_mines(self) -> List[Tuple[int, int]]:
+        hidden = (self.grid == MINE) & ~self.revealed
+        rows, cols = np.nonzero(hidden)
+        self.revealed[hidden] = True
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    def set_planes(self, cells: bytes, revealed_bits: bytes, flagged_bits: bytes, generated: bool):
+        n = self.size
+        packed = np.frombuffer(cells, dtype=np.uint8)
+        values = np.empty(2 * packed.size, dtype=np.uint8)
+        values[0::2] = packed & 0xF
+        values[1::2] = packed >> 4
+        grid = values[:n*n].astype(np.int8).reshape(n, n)
+        grid[grid == PACKED_MINE] = MINE
+        unpack = lambda bits: np.unpackbits(np.frombuffer(bits, dtype=np.uint8), bitorder='little')[:n*n].reshape(n, n)
+        rows, cols = np.nonzero(grid == MINE)
+        self.set_arrays(grid, unpack(revealed_bits).astype(bool), unpack(flagged_bits).astype(bool),
+                        list(zip(rows.tolist(), cols.tolist())), generated)
+
+    def to_planes(self) -> Tuple[bytes, bytes, bytes]:
+        values = self.grid.reshape(-1).astype(np.uint8)
+        values[values == 0xFF] = PACKED_MINE
+        if values.size % 2:
+            values = np.append(values, np.uint8(0))
+        cells = values[0::2] | (values[1::2] << 4)
+        pack = lambda plane: np.packbits(plane.reshape(-1), bitorder='little').tobytes()
+        return cells.tobytes(), pack(self.revealed), pack(self.flagged)
+
+    def to_lists(self):
+        """Plain-list copies of (grid, revealed, flagged) for JSON saving."""
+        return self.grid.tolist(), self.revealed.tolist(), self.flagged.tolist()
@@ -0,0 +1,301 @@
+# packed_board.py
+"""
+Compact Board engine for keeping many (paused) games in memory.
+- cell values packed 4 bits per cell: 0..8 adjacent count, 0xF for a mine
+- revealed / flagged stored as bitsets
+- mine_positions is derived from the packed cells instead of stored
+board.grid[r][c], board.revealed[r][c] and board.flagged[r][c] still work through
+lightweight row views, so Game and the UI need no changes.
+"""
+from typing import List, Tuple
+
+from board import Board, MINE, runs_to_cells, sample_mines
+from planes import (PACKED_MINE, pack_nibbles, unpack_nibbles, grid_to_cells, cells_to_grid,
+                    bools_to_bits, bits_to_bools)
+
+class _PlaneView:
+    """Row accessor so plane[r][c] reads (and writes) a packed plane."""
+    __slots__ = ('_board', '_get', '_set')
+
+    def __init__(self, board: 'PackedBoard', get, set_):
+        self._board = board
+        self._get = get
+        self._set = set_
+
+    def __len__(self):
+        return self._board.size
+
+    def __getitem__(self, r: int) -> '_RowView':
+        if not 0 <= r < self._board.size:
+            raise IndexError(r)
+        return _RowView(self, r)
+
+    def __iter__(self):
+        return (self[r] for r in range(self._board.size))
+
+class _RowView:
+    __slots__ = ('_plane', '_base')
+
+    def __init__(self, plane: _PlaneView, r: int):
+        self._plane = plane
+        self._base = r * plane._board.size
+
+    def __len__(self):
+        return self._plane._board.size
+
+    def __getitem__(self, c: int):
+        if not 0 <= c < self._plane._board.size:
+            raise IndexError(c)
+        return self._plane._get(self._base + c)
+
+    def __setitem__(self, c: int, value):
+        if not 0 <= c < self._plane._board.size:
+            raise IndexError(c)
+        self._plane._set(self._base + c, value)
+
+    def __iter__(self):
+        return (self[c] for c in range(self._plane._board.size))
+
+class PackedBoard(Board):
+    __slots__ = ('_cells', '_revealed_bits', '_flagged_bits')
+
+    def reset_arrays(self):
+        n = self.size * self.size
+        self._cells = bytearray((n + 1) // 2)
+        self._revealed_bits = bytearray((n + 7) // 8)
+        self._flagged_bits = bytearray((n + 7) // 8)
+        self.generated = False
+        self.revealed_safe = 0
+        self.flags_placed = 0
+
+    # -----------------------
+    # Flat cell access
+    # -----------------------
+    def _value(self, i: int) -> int:
+        b = self._cells[i >> 1]
+        v = b >> 4 if i & 1 else b & 0xF
+        return MINE if v == PACKED_MINE else v
+
+    def _set_value(self, i: int, value: int):
+        v = PACKED_MINE if value == MINE else value
+        b = self._cells[i >> 1]
+        self._cells[i >> 1] = (b & 0x0F) | (v << 4) if i & 1 else (b & 0xF0) | v
+
+    def _is_revealed(self, i: int) -> bool:
+        return bool(self._revealed_bits[i >> 3] >> (i & 7) & 1)
+
+    def _set_revealed(self, i: int, value: bool):
+        if value:
+            self._revealed_bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self._revealed_bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def _is_flagged(self, i: int) -> bool:
+        return bool(self._flagged_bits[i >> 3] >> (i & 7) & 1)
+
+    def _set_flagged(self, i: int, value: bool):
+        if value:
+            self._flagged_bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self._flagged_bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    @property
+    def grid(self) -> _PlaneView:
+        return _PlaneView(self, self._value, self._set_value)
+
+    @property
+    def revealed(self) -> _PlaneView:
+        return _PlaneView(self, self._is_revealed, self._set_revealed)
+
+    @property
+    def flagged(self) -> _PlaneView:
+        return _PlaneView(self, self._is_flagged, self._set_flagged)
+
+    @property
+    def mine_positions(self) -> List[Tuple[int,int]]:
+        n = self.size
+        values = unpack_nibbles(self._cells, n * n)
+        out = []
+        i = values.find(PACKED_MINE)
+        while i != -1:
+            out.append(divmod(i, n))
+            i = values.find(PACKED_MINE, i + 1)
+        return out
+
+    def set_arrays(self, grid, revealed, flagged, mine_positions, generated: bool):
+        # mine_positions is implied by grid
+        self.set_planes(grid_to_cells(grid), bools_to_bits(revealed), bools_to_bits(flagged), generated)
+
+    def set_planes(self, cells: bytes, revealed_bits: bytes, flagged_bits: bytes, generated: bool):
+        self.reset_arrays()
+        self._cells = bytearray(cells)
+        self._revealed_bits = bytearray(revealed_bits)
+        self._flagged_bits = bytearray(flagged_bits)
+        self.generated = bool(generated)
+        self.recount()
+
+    def to_planes(self):
+        return bytes(self._cells), bytes(self._revealed_bits), bytes(self._flagged_bits)
+
+    def to_lists(self):
+        n = self.size
+        return (cells_to_grid(self._cells, n), bits_to_bools(self._revealed_bits, n),
+                bits_to_bools(self._flagged_bits, n))
+
+    def scan_counts(self) -> Tuple[int,int]:
+        revealed_mines = sum(1 for (r, c) in self.mine_positions if self._is_revealed(r*self.size + c))
+        revealed = int.from_bytes(self._revealed_bits, 'little').bit_count()
+        flags = int.from_bytes(self._flagged_bits, 'little').bit_count()
+        return revealed - revealed_mines, flags
+
+    # -----------------------
+    # Board API
+    # -----------------------
+    def generate(self, start_r: int, start_c: int):
+        """Same placement (and rng use) as Board.generate; counts are accumulated around each mine."""
+        if self.layout_provider is not None:
+            positions = self.layout_provider(self, start_r, start_c)
+            if positions is not None:
+                self.place_mines(positions)
+                return
+        self._place_flat(sample_mines(self.rng, self.size, self.mines, start_r, start_c))
+
+    def place_mines(self, positions):
+        self._place_flat([r*self.size + c for (r, c) in positions])
+
+    def _place_flat(self, picks: List[int]):
+        self.reset_arrays()
+        n = self.size
+        values = bytearray(n * n)
+        for i in picks:
+            r, c = divmod(i, n)
+            for nr in (r-1, r, r+1):
+                if 0 <= nr < n:
+                    for nc in (c-1, c, c+1):
+                        if 0 <= nc < n:
+                            values[nr*n + nc] += 1
+        for i in picks:
+            values[i] = PACKED_MINE
+        self._cells = pack_nibbles(values)
+        self.generated = True
+
+    def reveal(self, r: int, c: int, runs: bool = False) -> list:
+        """Board.reveal's scanline fill, on flat indices into the packed planes."""
+        if not self.in_bounds(r, c):
+            return []
+        if not self.generated:
+            self.generate(r, c)
+        n = self.size
+        start = r*n + c
+        if self._is_flagged(start) or self._is_revealed(start):
+            return []
+        cells, rev, flg = self._cells, self._revealed_bits, self._flagged_bits
+        if self._value(start) != 0:
+            self._set_revealed(start, True)
+            self.revealed_safe += self._value(start) != MINE
+            return [(r, c, c)] if runs else [(r, c)]
+
+        def hidden(i):
+            return not (rev[i >> 3] | flg[i >> 3]) >> (i & 7) & 1
+
+        def zero(i):
+            b = cells[i >> 1]
+            return not (b >> 4 if i & 1 else b & 0xF)
+
+        def show(i):
+            rev[i >> 3] |= 1 << (i & 7)
+
+        def fill_span(sr, sc):
+            # hidden zeros around column sc of row sr; reveal them and return the span
+            base = sr * n
+            lo = sc
+            while lo > 0 and zero(base + lo-1) and hidden(base + lo-1):
+                lo -= 1
+            hi = sc
+            while hi < n-1 and zero(base + hi+1) and hidden(base + hi+1):
+                hi += 1
+            for i in range(base + lo, base + hi+1):
+                show(i)
+            return sr, lo, hi
+
+        out = []   # row runs
+        count = 0
+        stack = [fill_span(r, c)]
+        while stack:
+            sr, zlo, zhi = stack.pop()
+            base = sr * n
+            # numbered cells closing the span in its own row
+            lo, hi = zlo, zhi
+            if lo > 0 and hidden(base + lo-1):
+                show(base + lo-1)
+                lo -= 1
+            if hi < n-1 and hidden(base + hi+1):
+                show(base + hi+1)
+                hi += 1
+            out.append((sr, lo, hi))
+            count += hi - lo + 1
+            for nr in (sr-1, sr+1):
+                if not 0 <= nr < n:
+                    continue
+                base = nr * n
+                x, end = max(zlo-1, 0), min(zhi+1, n-1)
+                run_start = -1
+                while x <= end:
+                    i = base + x
+                    if not hidden(i):
+                        pass
+                    elif zero(i):
+                        span = fill_span(nr, x)
+                        stack.append(span)
+                        if run_start >= 0:
+                            out.append((nr, run_start, x-1))
+                            count += x - run_start
+                            run_start = -1
+                        x = span[2] + 1
+                        continue
+                    else:
+                        show(i)
+                        if run_start < 0:
+                            run_start = x
+                        x += 1
+                        continue
+                    if run_start >= 0:
+                        out.append((nr, run_start, x-1))
+                        count += x - run_start
+                        run_start = -1
+                    x += 1
+                if run_start >= 0:
+                    out.append((nr, run_start, x-1))
+                    count += x - run_start
+        # zeros never have mine neighbors, so everything revealed here is safe
+        self.revealed_safe += count
+        return out if runs else runs_to_cells(out)
+
+    def toggle_flag(self, r: int, c: int):
+        if not self.in_bounds(r, c):
+            return
+        i = r*self.size + c
+        if self._is_revealed(i):
+            return
+        flagged = not self._is_flagged(i)
+        self._set_flagged(i, flagged)
+        self.flags_placed += 1 if flagged else -1
+
+    def is_mine(self, r: int, c: int) -> bool:
+        return self.in_bounds(r, c) and self._value(r*self.size + c) == MINE
+
+    def count_adjacent_mines(self, r: int, c: int) -> int:
+        v = self._value(r*self.size + c)
+        if v != MINE:
+            return v
+        return sum(1 for nr in (r-1, r, r+1) for nc in (c-1, c, c+1)
+                   if (nr, nc) != (r, c) and self.is_mine(nr, nc))
+
+    def reveal_all_mines(self) -> List[Tuple[int,int]]:
+        revealed = []
+        for (r, c) in self.mine_positions:
+            i = r*self.size + c
+            if not self._is_revealed(i):
+                self._set_revealed(i, True)
+                revealed.append((r, c))
+        return revealed
@@ -0,0 +1,70 @@
+# planes.py
+"""
+Packed cell planes shared by PackedBoard and the binary save format.
+- cells: 4 bits per cell, 0..8 adjacent count, PACKED_MINE (0xF) for a mine;
+  even cell in the low nibble
+- bitsets: cell i at bit i (little-endian bit and byte order)
+All conversions go through bytes.translate / int.from_bytes so they run at C speed.
+"""
+from array import array
+from typing import List
+
+MINE = -1
+PACKED_MINE = 0xF
+
+_LOW = bytes(b & 0xF for b in range(256))
+_HIGH = bytes(b >> 4 for b in range(256))
+_SHIFT4 = bytes((b << 4) & 0xFF for b in range(256))
+# one byte per cell <-> signed grid values (0xF <-> 0xFF, i.e. -1 as int8)
+_TO_SIGNED = bytes(0xFF if b == PACKED_MINE else b for b in range(256))
+_FROM_SIGNED = bytes(PACKED_MINE if b == 0xFF else b & 0xF for b in range(256))
+_TO_DIGIT = bytes(0x31 if b else 0x30 for b in range(256))   # b'0' / b'1'
+_FROM_DIGIT = bytes(1 if b == 0x31 else 0 for b in range(256))
+
+def pack_nibbles(values: bytes) -> bytearray:
+    """Pack one byte per cell (each < 16) into two cells per byte."""
+    even, odd = values[0::2], values[1::2]
+    if len(odd) < len(even):
+        odd += b'\x00'
+    merged = int.from_bytes(even, 'little') | int.from_bytes(odd.translate(_SHIFT4), 'little')
+    return bytearray(merged.to_bytes(len(even), 'little'))
+
+def unpack_nibbles(packed: bytes, cells: int) -> bytearray:
+    """Inverse of pack_nibbles: one byte per cell."""
+    out = bytearray(2 * len(packed))
+    out[0::2] = packed.translate(_LOW)
+    out[1::2] = packed.translate(_HIGH)
+    del out[cells:]
+    return out
+
+def pack_bits(flags: bytes) -> bytearray:
+    """Bitset from one 0/1 byte per cell."""
+    if not flags:
+        return bytearray()
+    value = int(bytes(flags).translate(_TO_DIGIT)[::-1], 2)
+    return bytearray(value.to_bytes((len(flags) + 7) // 8, 'little'))
+
+def unpack_bits(bits: bytes, cells: int) -> bytearray:
+    """Inverse of pack_bits: one 0/1 byte per cell."""
+    if not cells:
+        return bytearray()
+    digits = format(int.from_bytes(bits, 'little'), f'0{len(bits) * 8}b').encode('ascii')[::-1]
+    return bytearray(digits[:cells].translate(_FROM_DIGIT))
+
+# -----------------------
+# list-of-lists grids (Board / JSON state) <-> planes
+# -----------------------
+def grid_to_cells(grid) -> bytearray:
+    flat = b''.join(array('b', row).tobytes() for row in grid)
+    return pack_nibbles(flat.translate(_FROM_SIGNED))
+
+def cells_to_grid(cells: bytes, size: int) -> List[List[int]]:
+    flat = memoryview(bytes(unpack_nibbles(cells, size * size).translate(_TO_SIGNED))).cast('b').tolist()
+    return [flat[r*size:(r+1)*size] for r in range(size)]
+
+def bools_to_bits(rows) -> bytearray:
+    return pack_bits(b''.join(bytes(row) for row in rows))
+
+def bits_to_bools(bits: bytes, size: int) -> List[List[bool]]:
+    flat = list(map(bool, unpack_bits(bits, size * size)))
+    return [flat[r*size:(r+1)*size] for r in range(size)]
@@ -0,0 +1,270 @@
+# probability.py
+"""
+Mine probabilities for hidden cells, from what the player can see.
+
+Like solver.py this only uses revealed numbers, which cells are hidden and the
+total mine count (board.mines); flags are ignored.
+
+Hidden cells next to a revealed number form the frontier. The frontier splits into
+independent components (cells linked through shared numbers). For each component,
+a memoized walk over its cells counts the consistent mine assignments per number
+of mines k, together with how many of them put a mine on each cell. The memo key
+is the position plus the residual counts of the numbers still "open" at that
+position, so long chains collapse to a few states.
+
+The remaining hidden cells (the interior) are unconstrained, and the components
+are combined with them combinatorially:
+
+    weight(k_1..k_j) = prod W_i(k_i) * C(interior, mines - sum k_i)
+
+Components that are too large or run past the time budget (budget_ms, wall clock)
+or the step budget (max_steps, memo misses per component, the same on every
+machine) get a local estimate instead, and the result is then marked exact=False.
+"""
+import time
+from math import comb
+from typing import Dict, List, Optional, Tuple
+
+Cell = Tuple[int,int]
+
+class _Timeout(Exception):
+    pass
+
+class Probabilities:
+    """Result of mine_probabilities(): frontier cells individually, one shared value for the interior."""
+    def __init__(self, board, frontier: Dict[Cell, float], interior: float, exact: bool):
+        self.board = board
+        self.frontier = frontier
+        self.interior = interior
+        self.exact = exact
+
+    def __getitem__(self, cell: Cell) -> float:
+        r, c = cell
+        if self.board.revealed[r][c]:
+            return 0.0
+        return self.frontier.get(cell, self.interior)
+
+    def safest(self) -> Optional[Cell]:
+        """Hidden, unflagged cell least likely to be a mine (frontier preferred on ties), or None."""
+        b = self.board
+        best, best_p = None, 2.0
+        for cell, p in self.frontier.items():
+            if p < best_p and not b.flagged[cell[0]][cell[1]]:
+                best, best_p = cell, p
+        if self.interior < best_p:
+            for r in range(b.size):
+                for c in range(b.size):
+                    if not b.revealed[r][c] and not b.flagged[r][c] and (r, c) not in self.frontier:
+                        return (r, c)
+        return best
+
+def _neighbors(n: int, r: int, c: int):
+    for nr in (r-1, r, r+1):
+        for nc in (c-1, c, c+1):
+            if (nr != r or nc != c) and 0 <= nr < n and 0 <= nc < n:
+                yield nr, nc
+
+def _constraints(board) -> List[Tuple[List[Cell], int]]:
+    n = board.size
+    grid, revealed = board.grid, board.revealed
+    out = []
+    for r in range(n):
+        rev = revealed[r]
+        row = grid[r]
+        for c in range(n):
+            if rev[c] and row[c] > 0:
+                cells = [(nr, nc) for (nr, nc) in _neighbors(n, r, c) if not revealed[nr][nc]]
+                if cells:
+                    out.append((cells, int(row[c])))
+    return out
+
+def _components(constraints) -> List[Tuple[List[Cell], List[Tuple[List[Cell], int]]]]:
+    """Group constraints whose cell sets are connected; cells are ordered breadth-first."""
+    by_cell: Dict[Cell, List[int]] = {}
+    for i, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            by_cell.setdefault(cell, []).append(i)
+    seen_con = [False] * len(constraints)
+    seen_cell = set()
+    comps = []
+    for start in range(len(constraints)):
+        if seen_con[start]:
+            continue
+        seen_con[start] = True
+        queue = [start]
+        order: List[Cell] = []
+        cons = []
+        while queue:
+            i = queue.pop(0)
+            cons.append(constraints[i])
+            for cell in constraints[i][0]:
+                if cell in seen_cell:
+                    continue
+                seen_cell.add(cell)
+                order.append(cell)
+                for j in by_cell[cell]:
+                    if not seen_con[j]:
+                        seen_con[j] = True
+                        queue.append(j)
+        comps.append((order, cons))
+    return comps
+
+def _count_component(cells: List[Cell], cons, deadline: Optional[float], max_steps: Optional[int] = None):
+    """
+    {k: (assignments with k mines, [assignments with a mine on cell i for each i])}
+    """
+    m = len(cells)
+    index = {cell: i for i, cell in enumerate(cells)}
+    members = [sorted(index[cell] for cell in con_cells) for con_cells, _ in cons]
+    first = [mem[0] for mem in members]
+    last = [mem[-1] for mem in members]
+    by_pos: List[List[int]] = [[] for _ in range(m)]
+    for j, mem in enumerate(members):
+        for i in mem:
+            by_pos[i].append(j)
+    # cells of constraint j at positions > i, for feasibility checks
+    left_after = {}
+    for j, mem in enumerate(members):
+        for k, i in enumerate(mem):
+            left_after[(j, i)] = len(mem) - k - 1
+    # constraints whose residual depends on choices made before position i
+    opens = [[j for j in range(len(cons)) if first[j] < i <= last[j]] for i in range(m + 1)]
+    rem = [value for _, value in cons]
+    memo: Dict[tuple, Dict[int, tuple]] = {}
+    calls = [0]
+
+    def walk(i: int) -> Dict[int, tuple]:
+        if i == m:
+            return {0: (1, [])}
+        key = (i, tuple(rem[j] for j in opens[i]))
+        hit = memo.get(key)
+        if hit is not None:
+            return hit
+        calls[0] += 1
+        if max_steps is not None and calls[0] > max_steps:
+            raise _Timeout()
+        if deadline is not None and calls[0] & 1023 == 0 and time.perf_counter() > deadline:
+            raise _Timeout()
+        out: Dict[int, list] = {}
+        for x in (0, 1):
+            ok = True
+            for j in by_pos[i]:
+                rem[j] -= x
+            for j in by_pos[i]:
+                if rem[j] < 0 or rem[j] > left_after[(j, i)]:
+                    ok = False
+                    break
+            if ok:
+                for k, (cnt, vec) in walk(i + 1).items():
+                    slot = out.get(k + x)
+                    if slot is None:
+                        out[k + x] = [cnt, [cnt if x else 0] + list(vec)]
+                    else:
+                        slot[0] += cnt
+                        v = slot[1]
+                        if x:
+                            v[0] += cnt
+                        for t, a in enumerate(vec, 1):
+                            v[t] += a
+            for j in by_pos[i]:
+                rem[j] += x
+        result = {k: (cnt, vec) for k, (cnt, vec) in out.items()}
+        memo[key] = result
+        return result
+
+    return walk(0)
+
+def _local_estimate(cells: List[Cell], cons) -> Dict[Cell, float]:
+    """Fallback: average of value / size over the numbers touching each cell."""
+    acc: Dict[Cell, List[float]] = {cell: [] for cell in cells}
+    for con_cells, value in cons:
+        for cell in con_cells:
+            acc[cell].append(value / len(con_cells))
+    return {cell: min(1.0, sum(v) / len(v)) for cell, v in acc.items()}
+
+def _poly_mul(a: Dict[int,int], b: Dict[int,int]) -> Dict[int,int]:
+    out: Dict[int,int] = {}
+    for i, x in a.items():
+        for j, y in b.items():
+            out[i + j] = out.get(i + j, 0) + x * y
+    return out
+
+def mine_probabilities(board, budget_ms: Optional[float] = 50.0, max_component: int = 600,
+                       max_steps: Optional[int] = None) -> Probabilities:
+    """
+    Probability that each hidden cell holds a mine. Exact unless a component had to
+    be estimated (too many cells, or the budget_ms / max_steps budget ran out).
+    budget_ms=None drops the wall-clock limit; with max_steps alone the result only
+    depends on the board.
+    """
+    n = board.size
+    mines = board.mines
+    hidden = sum(1 for r in range(n) for c in range(n) if not board.revealed[r][c])
+    if not board.generated or hidden == 0:
+        return Probabilities(board, {}, mines / hidden if hidden else 0.0, True)
+    deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000.0
+    exact = True
+    tables = []      # (cells, {k: (count, vec)}) for exactly counted components
+    estimated: Dict[Cell, float] = {}
+    for cells, cons in _components(_constraints(board)):
+        if exact and len(cells) <= max_component:
+            try:
+                tables.append((cells, _count_component(cells, cons, deadline, max_steps)))
+                continue
+            except _Timeout:
+                exact = False
+        else:
+            exact = False
+        estimated.update(_local_estimate(cells, cons))
+
+    frontier_cells = sum(len(cells) for cells, _ in tables) + len(estimated)
+    interior = hidden - frontier_cells
+    # estimated components are treated as holding their expected number of mines
+    left = mines - round(sum(estimated.values()))
+
+    polys = [{k: cnt for k, (cnt, _) in table.items()} for _, table in tables]
+    # leave-one-out products via prefix / suffix
+    prefix = [{0: 1}]
+    for p in polys:
+        prefix.append(_poly_mul(prefix[-1], p))
+    suffix = [{0: 1}]
+    for p in reversed(polys):
+        suffix.append(_poly_mul(suffix[-1], p))
+    suffix.reverse()
+
+    def ways_interior(k: int) -> int:
+        """Placements of the mines not on the frontier, given k frontier mines."""
+        need = left - k
+        if need < 0 or need > interior:
+            return 0
+        return comb(interior, need)
+
+    total = prefix[-1]
+    z = sum(w * ways_interior(k) for k, w in total.items())
+    frontier: Dict[Cell, float] = {}
+    if z == 0:
+        # the numbers cannot be matched with the mine count (only possible after estimating); use local odds
+        for cells, cons in _components(_constraints(board)):
+            frontier.update(_local_estimate(cells, cons))
+        rest = max(0, mines - round(sum(frontier.values())))
+        return Probabilities(board, frontier, min(1.0, rest / interior) if interior else 0.0, False)
+
+    for idx, (cells, table) in enumerate(tables):
+        others = _poly_mul(prefix[idx], suffix[idx + 1])
+        # weight of "this component has k mines" including all other components and the interior
+        weight = {k: sum(w * ways_interior(k + ko) for ko, w in others.items()) for k in table}
+        acc = [0] * len(cells)
+        for k, (_, vec) in table.items():
+            wk = weight[k]
+            if wk:
+                for i, a in enumerate(vec):
+                    acc[i] += a * wk
+        for cell, a in zip(cells, acc):
+            frontier[cell] = a / z
+    frontier.update(estimated)
+    interior_p = 0.0
+    if interior:
+        # a given interior cell is a mine: the other left-k-1 mines go into the other interior cells
+        interior_p = sum(w * comb(interior - 1, left - k - 1) for k, w in total.items()
+                         if 1 <= left - k <= interior) / z
+    return Probabilities(board, frontier, interior_p, exact)
@@ -0,0 +1,275 @@
+# server.py
+"""
+Asyncio server hosting many game_logic.Game sessions in one process.
+
+Protocol: one JSON object per line in each direction, over TCP or a Unix socket.
+Every request may carry an "id", which is echoed back in the reply.
+
+    {"op": "new", "size": 16, "mines": 40, "seed": 1, "engine": "packed", "no_guess": false}
+        -> {"ok": true, "session": "9f2c...", "size": 16, "mines": 40}
+        (engine: one of the installed finite engines, game_logic.available_engines())
+    {"op": "L", "session": "9f2c...", "r": 3, "c": 4}
+        -> {"ok": true, "runs": [[row, col_start, col_end, "0112*"], ...], "mines": [[r, c], ...],
+            "hit_mine": false, "win": false, "game_over": false}
+    {"op": "R", "session": "9f2c...", "r": 3, "c": 4}
+        -> {"ok": true, "flagged": true, "remaining_flags": 39}
+    {"op": "moves", "session": "9f2c...", "moves": [["L", 3, 4], ["R", 0, 0], ...]}
+        -> {"ok": true, "applied": 2, "runs": [...], "mines": [...], "flags": [[r, c, flagged], ...],
+            "hit_mine": false, "win": false, "game_over": false}
+    {"op": "close", "session": "9f2c..."}   -> {"ok": true}
+    {"op": "ping"}                           -> {"ok": true}
+    errors                                   -> {"ok": false, "error": "..."}
+
+Only the cells a move changed are sent: revealed row runs (col_end inclusive) with
+their values as one character per cell ('0'-'8', '*' for a mine), and on a loss the
+mine cells that were uncovered.
+
+Coordinates, size and mines must be JSON integers. no_guess boards are limited to
+max_no_guess_size. The first reveal of a game generates its board; that move runs in a
+worker thread so a large or no-guess deal does not stall other sessions.
+
+Sessions are not tied to a connection: a client may reconnect and keep playing.
+Sessions idle for longer than idle_timeout seconds are evicted. Each session has
+its own lock, so concurrent requests for the same game are applied one at a time.
+Each connection handles one request at a time and waits for its reply to drain
+before reading the next, so a slow reader cannot pile up unsent output.
+
+    python server.py --port 8765
+    python server.py --unix /tmp/minesweeper.sock
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import sys
+import time
+from typing import Any, Dict, List
+
+from board import MINE
+from game_logic import Game, available_engines
+
+class Session:
+    __slots__ = ('game', 'lock', 'last_used')
+
+    def __init__(self, game: Game):
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+def _int(value, name: str) -> int:
+    # bool is an int subclass, floats (1e400 included) are refused rather than truncated
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{name} must be an integer")
+    return value
+
+def _encode_runs(board, runs) -> List[list]:
+    out = []
+    grid = board.grid
+    for (r, lo, hi) in runs:
+        row = grid[r]
+        out.append([r, lo, hi, ''.join('*' if row[c] == MINE else str(row[c]) for c in range(lo, hi+1))])
+    return out
+
+class GameServer:
+    def __init__(self, idle_timeout: float = 600.0, max_sessions: int = 100000, max_size: int = 1000,
+                 max_no_guess_size: int = 64, max_line: int = 64 * 1024, engines: List[str] = None):
+        self.idle_timeout = idle_timeout
+        # endless boards are never offered: their flood fill and bounds are not per request
+        self.engines = available_engines(engines)
+        self.max_sessions = max_sessions
+        self.max_size = max_size
+        self.max_no_guess_size = max_no_guess_size
+        self.max_line = max_line
+        self.sessions: Dict[str, Session] = {}
+        self._server = None
+        self._reaper = None
+
+    # -----------------------
+    # Lifecycle
+    # -----------------------
+    async def start(self, host: str = '127.0.0.1', port: int = 8765, unix_path: str = None):
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_path, limit=self.max_line)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=self.max_line)
+        self._reaper = asyncio.ensure_future(self._reap())
+        return self._server
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _reap(self):
+        """Evict sessions idle for longer than idle_timeout."""
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 4))
+            self.evict_idle()
+
+    def evict_idle(self, now: float = None) -> int:
+        now = time.monotonic() if now is None else now
+        stale = [sid for sid, s in self.sessions.items()
+                 if now - s.last_used > self.idle_timeout and not s.lock.locked()]
+        for sid in stale:
+            del self.sessions[sid]
+        return len(stale)
+
+    # -----------------------
+    # Connections
+    # -----------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # line longer than max_line: the stream cannot be resynchronised
+                    writer.write(b'{"ok": false, "error": "line too long"}\n')
+                    break
+                if not line:
+                    break
+                msg = {}
+                try:
+                    msg = json.loads(line)
+                    if not isinstance(msg, dict):
+                        msg = {}
+                        raise ValueError("request must be a JSON object")
+                    reply = await self.dispatch(msg)
+                except (ValueError, KeyError, TypeError) as e:
+                    reply = {'ok': False, 'error': str(e)}
+                if 'id' in msg:
+                    reply['id'] = msg['id']
+                writer.write(json.dumps(reply, separators=(',', ':')).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # -----------------------
+    # Requests
+    # -----------------------
+    async def dispatch(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        op = msg.get('op')
+        if op == 'ping':
+            return {'ok': True}
+        if op == 'new':
+            return self._new(msg)
+        session = self.sessions.get(msg.get('session'))
+        if session is None:
+            return {'ok': False, 'error': "unknown session"}
+        if op == 'close':
+            self.sessions.pop(msg['session'], None)
+            return {'ok': True}
+        if op == 'moves':
+            moves = [(str(kind), _int(r, 'r'), _int(c, 'c')) for kind, r, c in msg['moves']]
+            if not all(kind in ('L', 'R') for kind, _, _ in moves):
+                return {'ok': False, 'error': "move kind must be 'L' or 'R'"}
+            async with session.lock:
+                session.last_used = time.monotonic()
+                board = session.game.board
+                if not all(board.in_bounds(r, c) for _, r, c in moves):
+                    return {'ok': False, 'error': "cell out of bounds"}
+                res = await self._play(session.game, session.game.apply_moves, moves, outcomes=False)
+                return {'ok': True, 'applied': res['applied'], 'runs': _encode_runs(board, res['revealed']),
+                        'mines': [list(cell) for cell in res['mines']], 'flags': [list(f) for f in res['flags']],
+                        'hit_mine': res['hit_mine'], 'win': res['win'], 'game_over': res['game_over']}
+        if op not in ('L', 'R'):
+            return {'ok': False, 'error': f"unknown op: {op!r}"}
+        r, c = _int(msg['r'], 'r'), _int(msg['c'], 'c')
+        async with session.lock:
+            session.last_used = time.monotonic()
+            game = session.game
+            if not game.board.in_bounds(r, c):
+                return {'ok': False, 'error': "cell out of bounds"}
+            if op == 'R':
+                res = game.right_click(r, c)
+                return {'ok': True, 'flagged': res['flagged'], 'remaining_flags': res['remaining_flags']}
+            res = await self._play(game, game.left_click, r, c, runs=True)
+            reply = {'ok': True, 'runs': _encode_runs(game.board, res['revealed']), 'mines': [],
+                     'hit_mine': res['hit_mine'], 'win': res['win'], 'game_over': res['game_over']}
+            if res['hit_mine']:
+                reply['mines'] = [[mr, mc] for (mr, mc) in game.board.mine_positions if (mr, mc) != (r, c)]
+            return reply
+
+    async def _play(self, game: Game, fn, *args, **kwargs):
+        """Run a move; the one that generates the board goes to a worker thread (the session lock is held)."""
+        if game.board.generated:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: fn(*args, **kwargs))
+
+    def _new(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        if len(self.sessions) >= self.max_sessions:
+            self.evict_idle()
+            if len(self.sessions) >= self.max_sessions:
+                return {'ok': False, 'error': "server full"}
+        size, mines = _int(msg.get('size', 9), 'size'), _int(msg.get('mines', 10), 'mines')
+        if not 1 <= size <= self.max_size:
+            return {'ok': False, 'error': f"size must be between 1 and {self.max_size}"}
+        if not 0 <= mines < size*size:
+            return {'ok': False, 'error': "mines must be smaller than the board area"}
+        engine = msg.get('engine') or 'list'
+        if engine not in self.engines:
+            return {'ok': False, 'error': f"engine must be one of: {', '.join(self.engines)}"}
+        no_guess = bool(msg.get('no_guess', False))
+        if no_guess and size > self.max_no_guess_size:
+            return {'ok': False, 'error': f"no_guess boards are limited to size {self.max_no_guess_size}"}
+        game = Game(size=size, mines=mines, seed=msg.get('seed'), engine=engine, no_guess=no_guess)
+        sid = secrets.token_hex(8)
+        self.sessions[sid] = Session(game)
+        return {'ok': True, 'session': sid, 'size': size, 'mines': mines}
+
+class Client:
+    """Minimal asyncio client, e.g. for tests and bots: `await client.request(op='ping')`."""
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765, unix_path: str = None) -> "Client":
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, **msg) -> Dict[str, Any]:
+        self.writer.write(json.dumps(msg).encode() + b'\n')
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Minesweeper multi-session game server")
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--unix', default=None, help="listen on a Unix socket path instead of TCP")
+    ap.add_argument('--idle-timeout', type=float, default=600.0, help="seconds before an idle session is evicted")
+    ap.add_argument('--max-sessions', type=int, default=100000)
+    args = ap.parse_args(argv)
+
+    async def run():
+        server = GameServer(idle_timeout=args.idle_timeout, max_sessions=args.max_sessions)
+        await server.start(args.host, args.port, unix_path=args.unix)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+# simulate.py
+"""
+Headless simulation / benchmark harness for game_logic.Game.
+
+Plays N seeded games per difficulty with a pluggable move policy, spread over a
+process pool, and reports throughput, latency percentiles and win rates as JSON.
+
+    python simulate.py --games 2000 --difficulty Easy Hard --policy random --workers 8
+
+A policy is a class constructed as Policy(game, rng) whose next_move() returns
+('L' | 'R', r, c), or None to give up. Pass a built-in name (see POLICIES) or
+"module:Class" for your own; it must be importable by the worker processes.
+"""
+import argparse
+import importlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from game_logic import Game, DIFFICULTIES
+
+class RandomPolicy:
+    """Click a uniformly random hidden, unflagged cell. Uses no hidden information."""
+    def __init__(self, game: Game, rng: random.Random):
+        self.game = game
+        self.rng = rng
+        n = game.board.size
+        self.hidden = [(r, c) for r in range(n) for c in range(n)]
+
+    def next_move(self) -> Optional[Tuple[str,int,int]]:
+        b = self.game.board
+        hidden = self.hidden
+        while hidden:
+            i = self.rng.randrange(len(hidden))
+            r, c = hidden[i]
+            # swap-remove so each pick is O(1)
+            hidden[i] = hidden[-1]
+            hidden.pop()
+            if not b.revealed[r][c] and not b.flagged[r][c]:
+                return ('L', r, c)
+        return None
+
+class ProbabilityPolicy:
+    """Click the hidden cell least likely to be a mine (probability.mine_probabilities). Uses no hidden information."""
+    def __init__(self, game: Game, rng: random.Random, budget_ms: float = 50.0):
+        self.game = game
+        self.budget_ms = budget_ms
+
+    def next_move(self) -> Optional[Tuple[str,int,int]]:
+        from probability import mine_probabilities
+        b = self.game.board
+        if not b.generated:
+            return ('L', b.size // 2, b.size // 2)
+        cell = mine_probabilities(b, budget_ms=self.budget_ms).safest()
+        return None if cell is None else ('L', cell[0], cell[1])
+
+POLICIES = {
+    'random': RandomPolicy,
+    'probability': ProbabilityPolicy,
+}
+
+def policy_class(name: str):
+    if name in POLICIES:
+        return POLICIES[name]
+    if ':' not in name:
+        raise ValueError(f"unknown policy: {name!r}")
+    module_name, cls_name = name.split(':', 1)
+    return getattr(importlib.import_module(module_name), cls_name)
+
+def nearest_rank(q: float, count: int) -> int:
+    """0-based index of the nearest-rank q-th percentile among count sorted values (count > 0)."""
+    return max(0, min(count - 1, math.ceil(q / 100.0 * count) - 1))
+
+def percentile(sorted_values: List[int], q: float) -> int:
+    """Nearest-rank percentile of an already sorted list (0 if empty)."""
+    if not sorted_values:
+        return 0
+    return sorted_values[nearest_rank(q, len(sorted_values))]
+
+def play_batch(difficulty: str, size: int, mines: int, seeds: List[int], policy: str,
+               engine=None, max_moves: int = 100000) -> Dict[str, Any]:
+    """Worker: play one game per seed. Latencies are in nanoseconds."""
+    cls = policy_class(policy)
+    clock = time.perf_counter_ns
+    click_ns: List[int] = []
+    generate_ns: List[int] = []
+    moves = wins = losses = 0
+    t0 = clock()
+    for seed in seeds:
+        game = Game(size=size, mines=mines, seed=seed, engine=engine)
+        pol = cls(game, random.Random(seed))
+        for _ in range(max_moves):
+            move = pol.next_move()
+            if move is None:
+                break
+            kind, r, c = move
+            if kind == 'L':
+                if not game.board.generated:
+                    # time generation on its own; reveal would otherwise trigger it
+                    g0 = clock()
+                    game.board.generate(r, c)
+                    generate_ns.append(clock() - g0)
+                s = clock()
+                game.left_click(r, c)
+                click_ns.append(clock() - s)
+            else:
+                game.right_click(r, c)
+            moves += 1
+            if game.game_over:
+                break
+        if game.win:
+            wins += 1
+        elif game.game_over:
+            losses += 1
+    return {
+        'difficulty': difficulty,
+        'games': len(seeds),
+        'moves': moves,
+        'wins': wins,
+        'losses': losses,
+        'wall_ns': clock() - t0,
+        'click_ns': click_ns,
+        'generate_ns': generate_ns,
+    }
+
+def run(games: int, difficulties: Dict[str, Tuple[int,int]], policy: str = 'random', workers: int = None,
+        engine=None, base_seed: int = 0, batch_size: int = 50) -> Dict[str, Any]:
+    """Play `games` games per difficulty and aggregate the results."""
+    workers = workers or os.cpu_count() or 1
+    batches = []
+    for name, (size, mines) in difficulties.items():
+        seeds = [base_seed + i for i in range(games)]
+        for i in range(0, games, batch_size):
+            batches.append((name, size, mines, seeds[i:i + batch_size], policy, engine))
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [play_batch(*b) for b in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(play_batch, *zip(*batches)))
+    wall = time.perf_counter() - t0
+
+    report = {'policy': policy, 'engine': engine or 'list', 'workers': workers,
+              'wall_sec': round(wall, 4), 'difficulties': {}}
+    for name, (size, mines) in difficulties.items():
+        parts = [res for res in results if res['difficulty'] == name]
+        click = sorted(x for res in parts for x in res['click_ns'])
+        gen = sorted(x for res in parts for x in res['generate_ns'])
+        n_games = sum(res['games'] for res in parts)
+        n_moves = sum(res['moves'] for res in parts)
+        wins = sum(res['wins'] for res in parts)
+        # per-difficulty throughput is CPU time summed over workers
+        busy = sum(res['wall_ns'] for res in parts) / 1e9 or 1e-9
+        report['difficulties'][name] = {
+            'size': size,
+            'mines': mines,
+            'games': n_games,
+            'moves': n_moves,
+            'wins': wins,
+            'losses': sum(res['losses'] for res in parts),
+            'win_rate': wins / n_games if n_games else 0.0,
+            'games_per_sec': n_games / busy,
+            'moves_per_sec': n_moves / busy,
+            'left_click_us': {'p50': percentile(click, 50) / 1e3, 'p99': percentile(click, 99) / 1e3,
+                              'max': (click[-1] if click else 0) / 1e3},
+            'generate_us': {'p50': percentile(gen, 50) / 1e3, 'p99': percentile(gen, 99) / 1e3,
+                            'max': (gen[-1] if gen else 0) / 1e3},
+        }
+    total_games = sum(d['games'] for d in report['difficulties'].values())
+    total_moves = sum(d['moves'] for d in report['difficulties'].values())
+    report['games_per_sec'] = total_games / wall if wall else 0.0
+    report['moves_per_sec'] = total_moves / wall if wall else 0.0
+    return report
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless Minesweeper simulation and benchmark")
+    ap.add_argument('--games', type=int, default=200, help="games per difficulty")
+    ap.add_argument('--difficulty', nargs='+', default=list(DIFFICULTIES),
+                    help="difficulty names, or SIZExMINES for custom boards (e.g. 500x50000)")
+    ap.add_argument('--policy', default='random', help="policy name or module:Class")
+    ap.add_argument('--engine', default=None, help="board engine (see game_logic.ENGINES)")
+    ap.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument('--seed', type=int, default=0, help="first seed; game i uses seed+i")
+    ap.add_argument('--out', default='-', help="JSON output file ('-' for stdout)")
+    args = ap.parse_args(argv)
+
+    difficulties = {}
+    for name in args.difficulty:
+        if name in DIFFICULTIES:
+            difficulties[name] = DIFFICULTIES[name]
+        else:
+            size, mines = name.lower().split('x')
+            difficulties[name] = (int(size), int(mines))
+    report = run(args.games, difficulties, policy=args.policy, workers=args.workers,
+                 engine=args.engine, base_seed=args.seed)
+    text = json.dumps(report, indent=2)
+    if args.out == '-':
+        print(text)
+    else:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# solver.py
+"""
+Incremental frontier solver used for honest hints.
+
+Only looks at what the player can see: revealed numbers and which cells are still
+hidden. Every revealed number becomes a constraint "these hidden neighbors hold k
+mines". Constraints are updated from the `revealed` list Game.left_click returns,
+so a move costs work proportional to the cells it changed, not to the board.
+
+Deductions:
+- single point: k == 0 -> all safe, k == len(cells) -> all mines
+- subset: A.cells <= B.cells -> B.cells - A.cells hold B.k - A.k mines
+Player flags are ignored; only mines the solver proved itself are used.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+Cell = Tuple[int,int]
+
+class Solver:
+    def __init__(self, board, scan: bool = True):
+        self.board = board
+        # revealed number cell -> [hidden undetermined neighbors, mines among them]
+        self.constraints: Dict[Cell, List] = {}
+        # hidden undetermined cell -> keys of constraints that mention it
+        self.by_cell: Dict[Cell, Set[Cell]] = {}
+        self.safe: Set[Cell] = set()     # proven safe, not yet revealed
+        self.mines: Set[Cell] = set()    # proven mines
+        self._dirty: Set[Cell] = set()
+        if scan and board.generated:
+            self.rebuild()
+
+    def _neighbors(self, r: int, c: int) -> List[Cell]:
+        b = self.board
+        return [(nr, nc) for nr in (r-1, r, r+1) for nc in (c-1, c, c+1)
+                if (nr != r or nc != c) and b.in_bounds(nr, nc)]
+
+    def rebuild(self):
+        """Full rescan of a finite board (after load / undo); normal play uses update()."""
+        b = self.board
+        self.constraints.clear()
+        self.by_cell.clear()
+        self.safe.clear()
+        self.mines.clear()
+        self._dirty.clear()
+        self.update([(r, c) for r in range(b.size) for c in range(b.size) if b.revealed[r][c]])
+
+    # -----------------------
+    # Incremental updates
+    # -----------------------
+    def update(self, revealed: Iterable[Cell]):
+        """Feed cells that just became revealed (Game.left_click()['revealed'])."""
+        revealed = list(revealed)
+        for cell in revealed:
+            self.safe.discard(cell)
+            for key in self.by_cell.pop(cell, ()):
+                con = self.constraints.get(key)
+                if con is not None:
+                    con[0].discard(cell)
+                    self._dirty.add(key)
+        grid = self.board.grid
+        for (r, c) in revealed:
+            v = grid[r][c]
+            if v > 0:
+                self._add_constraint((r, c), v)
+
+    def _add_constraint(self, key: Cell, value: int):
+        b = self.board
+        cells = set()
+        for (nr, nc) in self._neighbors(*key):
+            if (nr, nc) in self.mines:
+                value -= 1
+            elif not b.revealed[nr][nc] and (nr, nc) not in self.safe:
+                cells.add((nr, nc))
+        if not cells:
+            return
+        self.constraints[key] = [cells, value]
+        for cell in cells:
+            self.by_cell.setdefault(cell, set()).add(key)
+        self._dirty.add(key)
+
+    def _resolve(self, cell: Cell, is_mine: bool):
+        """Record a proven cell and remove it from every constraint mentioning it."""
+        if cell in self.mines or cell in self.safe:
+            return
+        (self.mines if is_mine else self.safe).add(cell)
+        for key in self.by_cell.pop(cell, ()):
+            con = self.constraints.get(key)
+            if con is not None:
+                con[0].discard(cell)
+                if is_mine:
+                    con[1] -= 1
+                self._dirty.add(key)
+
+    def _drop(self, key: Cell):
+        con = self.constraints.pop(key, None)
+        if con is None:
+            return
+        for cell in con[0]:
+            keys = self.by_cell.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.by_cell[cell]
+
+    def _apply(self, cells: Set[Cell], mines: int) -> bool:
+        if not cells:
+            return False
+        if mines == 0:
+            for cell in list(cells):
+                self._resolve(cell, False)
+            return True
+        if mines == len(cells):
+            for cell in list(cells):
+                self._resolve(cell, True)
+            return True
+        return False
+
+    # -----------------------
+    # Deduction
+    # -----------------------
+    def solve(self, budget: int = 20000) -> int:
+        """
+        Process dirty constraints until nothing changes or `budget` constraint
+        comparisons were made; leftover work is kept for the next call.
+        Returns the number of comparisons used.
+        """
+        steps = 0
+        constraints = self.constraints
+        while self._dirty and steps < budget:
+            key = self._dirty.pop()
+            con = constraints.get(key)
+            if con is None:
+                continue
+            steps += 1
+            if not con[0]:
+                self._drop(key)
+                continue
+            if self._apply(con[0], con[1]):
+                self._drop(key)
+                continue
+            others = set()
+            for cell in con[0]:
+                others |= self.by_cell.get(cell, set())
+            others.discard(key)
+            for other in others:
+                steps += 1
+                ocon = constraints.get(other)
+                if ocon is None or not con[0]:
+                    continue
+                a, ka = con
+                b, kb = ocon
+                if a <= b:
+                    self._apply(b - a, kb - ka)
+                elif b <= a:
+                    self._apply(a - b, ka - kb)
+        return steps
+
+    def safe_cells(self, budget: int = 20000) -> Set[Cell]:
+        self.solve(budget)
+        return {cell for cell in self.safe if not self.board.revealed[cell[0]][cell[1]]}
+
+    def hint(self, budget: int = 20000) -> Optional[Cell]:
+        """A hidden cell that is provably safe, or None if none can be deduced (yet)."""
+        b = self.board
+        if not b.generated:
+            # the first click is always safe
+            return (b.size // 2, b.size // 2)
+        self.solve(budget)
+        for cell in self.safe:
+            if not b.revealed[cell[0]][cell[1]] and not b.flagged[cell[0]][cell[1]]:
+                return cell
+        return None
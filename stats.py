@@ -0,0 +1,242 @@
+# stats.py
+"""
+Persistent game statistics and leaderboards in SQLite.
+
+record() only appends to an in-memory queue; a background thread writes queued
+results in batches (one transaction per batch), so finishing a game never waits
+on the disk. Queries use their own connection and are served from indexes:
+- results_board (difficulty, won, seconds): top-N and percentiles per difficulty
+- results_seed (difficulty, seed): everybody's result on one seeded / daily board
+- results_time (finished_at): recent results
+- win_buckets (difficulty, bucket): wins per whole second of winning time, kept up to
+  date by triggers; percentiles add up buckets instead of skipping rows one by one
+
+    store = StatsStore("minesweeper stats.db")
+    store.record("Hard", 22, 99, won=True, seconds=143.2, seed=None)
+    store.top("Hard", 10)
+
+Seeds are stored as signed 64-bit integers (SQLite's INTEGER): larger or negative
+seeds are folded into that range modulo 2**64, see seed_column().
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from game_logic import DIFFICULTIES
+from simulate import nearest_rank
+
+STATS_FILENAME = "minesweeper stats.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    seed INTEGER,
+    won INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    player TEXT NOT NULL DEFAULT '',
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_board ON results (difficulty, won, seconds);
+CREATE INDEX IF NOT EXISTS results_seed ON results (difficulty, seed);
+CREATE INDEX IF NOT EXISTS results_time ON results (finished_at);
+CREATE TABLE IF NOT EXISTS win_buckets (
+    difficulty TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    PRIMARY KEY (difficulty, bucket)
+) WITHOUT ROWID;
+"""
+
+# bucket = floor(seconds); CAST alone truncates towards zero
+_BUCKET = "(CAST({0} AS INTEGER) - ({0} < CAST({0} AS INTEGER)))"
+
+_BUCKETS = f"""
+CREATE TRIGGER IF NOT EXISTS results_win_added AFTER INSERT ON results WHEN NEW.won = 1
+BEGIN
+    INSERT INTO win_buckets (difficulty, bucket, wins) VALUES (NEW.difficulty, {_BUCKET.format('NEW.seconds')}, 1)
+        ON CONFLICT (difficulty, bucket) DO UPDATE SET wins = wins + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS results_win_removed AFTER DELETE ON results WHEN OLD.won = 1
+BEGIN
+    UPDATE win_buckets SET wins = wins - 1
+        WHERE difficulty = OLD.difficulty AND bucket = {_BUCKET.format('OLD.seconds')};
+END;
+"""
+
+# databases from before win_buckets: fill it once, before the triggers exist (they keep it in step afterwards)
+_BACKFILL = f"""
+INSERT INTO win_buckets (difficulty, bucket, wins)
+    SELECT difficulty, {_BUCKET.format('seconds')} AS b, COUNT(*) FROM results
+    WHERE won = 1 AND NOT EXISTS (SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'results_win_added')
+    GROUP BY difficulty, b;
+"""
+
+_INSERT = ("INSERT INTO results (difficulty, size, mines, seed, won, seconds, player, finished_at) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+_log = logging.getLogger(__name__)
+
+def seed_column(seed: Optional[int]) -> Optional[int]:
+    """A seed as stored in the seed column: identical within signed 64-bit range, else wrapped modulo 2**64."""
+    if seed is None:
+        return None
+    return (int(seed) + (1 << 63)) % (1 << 64) - (1 << 63)
+
+def difficulty_name(size: int, mines: int) -> str:
+    """Name from game_logic.DIFFICULTIES, or 'SIZExMINES' for custom boards."""
+    for name, dims in DIFFICULTIES.items():
+        if dims == (size, mines):
+            return name
+    return f"{size}x{mines}"
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+class StatsStore:
+    def __init__(self, path: str = STATS_FILENAME, batch_size: int = 500, flush_interval: float = 1.0):
+        self.path = path
+        self.batch_size = int(batch_size)
+        self.flush_interval = flush_interval
+        with _connect(path) as conn:
+            conn.executescript("BEGIN IMMEDIATE;" + _SCHEMA + _BACKFILL + _BUCKETS + "COMMIT;")
+        self._read = _connect(path)
+        self._read_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self.dropped = 0          # rows the writer could not insert
+        self.last_error: Optional[BaseException] = None
+        self._writer = threading.Thread(target=self._write_loop, name="stats-writer", daemon=True)
+        self._writer.start()
+
+    # -----------------------
+    # Writes
+    # -----------------------
+    def record(self, difficulty: str, size: int, mines: int, won: bool, seconds: float,
+               seed: int = None, player: str = '', finished_at: float = None):
+        """Queue one finished game; returns immediately."""
+        self._queue.put((difficulty, size, mines, seed_column(seed), int(bool(won)), float(seconds), player,
+                         time.time() if finished_at is None else finished_at))
+
+    def record_many(self, rows: List[tuple]):
+        """Queue (difficulty, size, mines, seed, won, seconds, player, finished_at) rows, e.g. tournament imports."""
+        self._queue.put([tuple(row[:3]) + (seed_column(row[3]),) + tuple(row[4:]) for row in rows])
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        stop = False
+        while not stop:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            done = []
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    done.append(item)
+                elif isinstance(item, list):
+                    batch.extend(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._insert(conn, batch)
+            for event in done:
+                event.set()
+        conn.close()
+
+    def _insert(self, conn: sqlite3.Connection, batch: List[tuple]):
+        """Write one batch; a bad row must not take the writer thread (and every later record) down."""
+        try:
+            with conn:
+                conn.executemany(_INSERT, batch)
+            return
+        except (sqlite3.Error, OverflowError, ValueError, TypeError) as e:
+            _log.warning("stats batch of %d rows failed (%s); retrying row by row", len(batch), e)
+        for row in batch:
+            try:
+                with conn:
+                    conn.execute(_INSERT, row)
+            except (sqlite3.Error, OverflowError, ValueError, TypeError) as e:
+                self.dropped += 1
+                self.last_error = e
+                _log.warning("stats row %r dropped: %s", row, e)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until everything queued so far is written."""
+        event = threading.Event()
+        self._queue.put(event)
+        return event.wait(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        with self._read_lock:
+            self._read.close()
+
+    # -----------------------
+    # Queries
+    # -----------------------
+    def _query(self, sql: str, args=()) -> List[tuple]:
+        with self._read_lock:
+            return self._read.execute(sql, args).fetchall()
+
+    def top(self, difficulty: str, n: int = 10, seed: int = None) -> List[Dict[str, Any]]:
+        """Fastest wins for a difficulty (optionally only on one seeded board)."""
+        if seed is None:
+            rows = self._query("SELECT seconds, player, seed, finished_at FROM results "
+                               "WHERE difficulty = ? AND won = 1 ORDER BY seconds LIMIT ?", (difficulty, n))
+        else:
+            rows = self._query("SELECT seconds, player, seed, finished_at FROM results "
+                               "WHERE difficulty = ? AND seed = ? AND won = 1 ORDER BY seconds LIMIT ?",
+                               (difficulty, seed_column(seed), n))
+        return [{'seconds': s, 'player': p, 'seed': sd, 'finished_at': t} for (s, p, sd, t) in rows]
+
+    def percentile(self, difficulty: str, q: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of winning times (None if there are no wins).
+        The bucket holding the rank is found from win_buckets; only the rows inside that
+        one-second bucket are skipped through the results_board index.
+        """
+        with self._read_lock, self._read:
+            # one read transaction, so buckets and rows agree while the writer commits
+            self._read.execute("BEGIN")
+            buckets = self._read.execute("SELECT bucket, wins FROM win_buckets WHERE difficulty = ? AND wins > 0 "
+                                         "ORDER BY bucket", (difficulty,)).fetchall()
+            count = sum(wins for _, wins in buckets)
+            if not count:
+                return None
+            k = nearest_rank(q, count)
+            for bucket, wins in buckets:
+                if k < wins:
+                    break
+                k -= wins
+            return self._read.execute("SELECT seconds FROM results WHERE difficulty = ? AND won = 1 AND seconds >= ? "
+                                      "ORDER BY seconds LIMIT 1 OFFSET ?", (difficulty, bucket, k)).fetchone()[0]
+
+    def rank(self, difficulty: str, seconds: float) -> int:
+        """1-based leaderboard position a winning time would take."""
+        (better,) = self._query("SELECT COUNT(*) FROM results WHERE difficulty = ? AND won = 1 AND seconds < ?",
+                                (difficulty, seconds))[0]
+        return better + 1
+
+    def summary(self, difficulty: str) -> Dict[str, Any]:
+        (games,) = self._query("SELECT COUNT(*) FROM results WHERE difficulty = ?", (difficulty,))[0]
+        (wins,) = self._query("SELECT COUNT(*) FROM results WHERE difficulty = ? AND won = 1", (difficulty,))[0]
+        return {'games': games, 'wins': wins, 'win_rate': wins / games if games else 0.0,
+                'best': self.percentile(difficulty, 0), 'median': self.percentile(difficulty, 50)}
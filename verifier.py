@@ -0,0 +1,218 @@
+# verifier.py
+"""
+Replay verification for leaderboard submissions.
+
+A submission is one JSON object per line:
+
+    {"id": "abc", "player": "sam", "seed": 1234, "size": 16, "mines": 40,
+     "no_guess": false, "outcome": "win", "seconds": 41,
+     "moves": [[0, "L", 8, 8], [1450, "R", 7, 9], [2210, "L", 6, 9], ...]}
+
+Each move is [milliseconds since the game started, 'L' | 'R', row, col]. The game
+is rebuilt from the seed with game_logic.Game and replayed move by move:
+- legality: well-formed, in bounds, no moves after the game ended
+- outcome: the replayed result must be the claimed one (unfinished games are rejected)
+- time: timestamps never go backwards and the claimed seconds match the last
+  move within time_tolerance (the app's timer counts whole seconds)
+- hidden information: reveals of cells the visible numbers do not prove safe
+  (solver.Solver) are guesses. Each one that survives multiplies the game's luck by
+  1 - P(mine) (probability.mine_probabilities); below luck_limit the game is
+  rejected, since only someone who can see the mines survives that many guesses.
+  The probabilities use a step budget (PROB_STEPS) rather than a time budget, so a
+  submission gets the same verdict on every machine and under any load.
+Undo is not part of the format, so games that used it cannot be submitted.
+
+verify_stream() feeds batches of raw lines to a process pool with a bounded number
+of batches in flight, so input is read and results are written while workers run,
+in input order, with memory independent of the input size.
+
+    python verifier.py submissions.jsonl --out results.jsonl --workers 8
+    python verifier.py - --stats "minesweeper stats.db" < submissions.jsonl   # record accepted games
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List
+
+from game_logic import Game
+
+MAX_SIZE = 100            # largest board accepted for ranking
+TIME_TOLERANCE = 1.0      # seconds
+LUCK_LIMIT = 1e-6         # rejected below this chance of surviving the guesses
+PROB_STEPS = 200000       # mine_probabilities work limit per frontier component (deterministic)
+SEED_BITS = 64            # seeds must fit a signed 64-bit integer, like the stats store's seed column
+
+def verify(sub: Dict[str, Any], max_size: int = MAX_SIZE, time_tolerance: float = TIME_TOLERANCE,
+           luck_limit: float = LUCK_LIMIT) -> Dict[str, Any]:
+    """Replay one submission. Returns {'id', 'ok', 'problems', 'outcome', 'seconds', 'moves', 'guesses', 'luck'}."""
+    problems: List[str] = []
+    result = {'id': sub.get('id'), 'ok': False, 'problems': problems, 'outcome': None,
+              'seconds': None, 'moves': 0, 'guesses': 0, 'luck': 1.0}
+    seed, size, mines, moves = sub.get('seed'), sub.get('size'), sub.get('mines'), sub.get('moves')
+    if not all(type(v) is int for v in (seed, size, mines)) or not isinstance(moves, list):
+        problems.append("seed, size, mines must be integers and moves a list")
+        return result
+    if not -(1 << (SEED_BITS - 1)) <= seed < 1 << (SEED_BITS - 1):
+        problems.append(f"seed must fit a signed {SEED_BITS}-bit integer")
+        return result
+    if not 2 <= size <= max_size or not 0 < mines < size * size:
+        problems.append(f"board {size}x{size} with {mines} mines is not accepted")
+        return result
+    if len(moves) > 4 * size * size:
+        problems.append("more moves than the board allows")
+        return result
+
+    game = Game(size, mines, seed=seed, no_guess=bool(sub.get('no_guess')))
+    board = game.board
+    solver = None
+    log_luck = 0.0
+    last_t = 0
+    for i, move in enumerate(moves):
+        # json.loads accepts NaN / Infinity, which compare False both ways and would skip the time checks
+        if not (isinstance(move, list) and len(move) == 4 and isinstance(move[0], (int, float))
+                and math.isfinite(move[0]) and move[1] in ('L', 'R')
+                and type(move[2]) is int and type(move[3]) is int):
+            problems.append(f"move {i}: malformed {move!r}")
+            break
+        t, kind, r, c = move
+        if t < last_t:
+            problems.append(f"move {i}: timestamp goes backwards")
+            break
+        last_t = t
+        if game.game_over:
+            problems.append(f"move {i}: played after the game ended")
+            break
+        if not board.in_bounds(r, c):
+            problems.append(f"move {i}: ({r}, {c}) is off the board")
+            break
+        result['moves'] = i + 1
+        if kind == 'R':
+            game.right_click(r, c)
+            continue
+        p = 0.0
+        if board.generated and not board.revealed[r][c] and not board.flagged[r][c] and luck_limit:
+            if solver is None:
+                from solver import Solver
+                solver = Solver(board)
+            solver.solve()
+            if (r, c) not in solver.safe:
+                from probability import mine_probabilities
+                p = mine_probabilities(board, budget_ms=None, max_steps=PROB_STEPS)[r, c]
+                result['guesses'] += 1
+        res = game.left_click(r, c)
+        if solver is not None:
+            solver.update(res['revealed'])
+        if p and not res['hit_mine']:
+            log_luck += math.log1p(-min(p, 1.0 - 1e-12))
+            if log_luck < math.log(luck_limit):
+                problems.append(f"move {i}: survived {result['guesses']} guesses with probability "
+                                f"{math.exp(log_luck):.2g} (hidden information?)")
+                break
+    result['luck'] = math.exp(log_luck)
+    if problems:
+        return result
+
+    outcome = ('win' if game.win else 'loss') if game.game_over else 'unfinished'
+    result['outcome'] = outcome
+    if outcome == 'unfinished':
+        problems.append("the moves do not finish the game")
+    elif sub.get('outcome') != outcome:
+        problems.append(f"claimed outcome {sub.get('outcome')!r}, replay gives {outcome!r}")
+    seconds = sub.get('seconds')
+    if not isinstance(seconds, (int, float)) or not math.isfinite(seconds) or seconds < 0:
+        problems.append("seconds must be a finite non-negative number")
+    elif abs(seconds - last_t / 1000.0) > time_tolerance:
+        problems.append(f"claimed {seconds}s but the last move was at {last_t / 1000.0:.1f}s")
+    else:
+        result['seconds'] = seconds
+    result['ok'] = not problems
+    return result
+
+def verify_line(line: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        sub = json.loads(line)
+        if not isinstance(sub, dict):
+            raise ValueError("not an object")
+    except ValueError as e:
+        return {'id': None, 'ok': False, 'problems': [f"unreadable submission: {e}"]}
+    result = verify(sub, **options)
+    if result['ok']:
+        # carried along for recording; not part of the check
+        result['player'] = sub.get('player', '')
+        result.update(size=sub['size'], mines=sub['mines'], seed=sub['seed'])
+    return result
+
+def verify_batch(lines: List[str], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Worker: verify a batch of raw JSON lines."""
+    return [verify_line(line, options) for line in lines]
+
+def verify_stream(lines: Iterable[str], workers: int = None, batch_size: int = 200,
+                  **options) -> Iterator[Dict[str, Any]]:
+    """Verify JSON lines on a process pool; yields results in input order as batches finish."""
+    workers = workers or os.cpu_count() or 1
+    lines = (line for line in lines if line.strip())
+    batches = iter(lambda: list(itertools.islice(lines, batch_size)), [])
+    if workers == 1:
+        for batch in batches:
+            yield from verify_batch(batch, options)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(pool.submit(verify_batch, batch, options))
+            # bounded read-ahead: enough to keep every worker busy
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Verify leaderboard submissions by replaying them")
+    ap.add_argument('input', help="JSON lines file ('-' for stdin)")
+    ap.add_argument('--out', default='-', help="JSON lines results ('-' for stdout)")
+    ap.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument('--batch-size', type=int, default=200)
+    ap.add_argument('--max-size', type=int, default=MAX_SIZE)
+    ap.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE)
+    ap.add_argument('--luck-limit', type=float, default=LUCK_LIMIT, help="0 disables the hidden-information check")
+    ap.add_argument('--stats', default=None, help="record accepted games in this stats.StatsStore database")
+    args = ap.parse_args(argv)
+
+    src = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', encoding='utf-8')
+    store = None
+    if args.stats:
+        from stats import StatsStore, difficulty_name
+        store = StatsStore(args.stats)
+    total = accepted = 0
+    t0 = time.perf_counter()
+    try:
+        for res in verify_stream(src, workers=args.workers, batch_size=args.batch_size, max_size=args.max_size,
+                                 time_tolerance=args.time_tolerance, luck_limit=args.luck_limit):
+            total += 1
+            if res['ok']:
+                accepted += 1
+                if store is not None:
+                    store.record(difficulty_name(res['size'], res['mines']), res['size'], res['mines'],
+                                 res['outcome'] == 'win', res['seconds'], seed=res['seed'], player=res['player'])
+            out.write(json.dumps(res) + '\n')
+    finally:
+        if store is not None:
+            store.close()
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    wall = time.perf_counter() - t0
+    print(f"{total} submissions, {accepted} accepted, {total - accepted} rejected "
+          f"({total / wall if wall else 0:.0f}/s)", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())